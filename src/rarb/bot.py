@@ -269,6 +269,7 @@ class RealtimeArbitrageBot:
         # Cached USDC balance (updated periodically and after trades)
         self._cached_balance: Decimal = Decimal("0")
         self._balance_lock = asyncio.Lock()
+        self._portfolio_tracker = None  # Created on first balance refresh
 
     async def _on_markets_loaded(self, markets: list) -> None:
         """
@@ -617,7 +618,9 @@ class RealtimeArbitrageBot:
         from rarb.tracking.portfolio import PortfolioTracker, BalanceSnapshot
 
         try:
-            tracker = PortfolioTracker()
+            if self._portfolio_tracker is None:
+                self._portfolio_tracker = PortfolioTracker()
+            tracker = self._portfolio_tracker
             balances = await tracker.get_current_balances()
             balance = Decimal(str(balances.get("polymarket_usdc", 0)))
 
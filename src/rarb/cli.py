@@ -1,18 +1,189 @@
 """Command-line interface for rarb."""
 
 import asyncio
+import functools
+import heapq
+import json
+import signal
 import sys
-from typing import Optional
+from operator import attrgetter
+from typing import Any, Coroutine, Iterable, Optional, Sequence, TypeVar
 
 import click
 from rich.console import Console
 from rich.table import Table
+from rich.text import Text
 
 from rarb import __version__
 from rarb.config import get_settings, reload_settings
 from rarb.utils.logging import setup_logging
 
-console = Console()
+try:
+    import uvloop
+except ImportError:  # optional speedup, install with `pip install rarb[fast]`
+    uvloop = None
+
+try:
+    import orjson
+except ImportError:  # optional speedup, install with `pip install rarb[fast]`
+    orjson = None
+
+# Parses the raw response bytes; both accept bytes directly
+_json_loads = orjson.loads if orjson else json.loads
+
+# Output is explicitly styled via markup, so skip Rich's regex auto-highlighter
+# and :emoji: code substitution on every print
+console = Console(highlight=False, emoji=False)
+
+# Piped/redirected output skips Rich and is written as plain TSV
+_IS_TTY = sys.stdout.isatty()
+
+T = TypeVar("T")
+
+_by_price = attrgetter("price")
+
+# Row formatters, bound once so per-row rendering skips format-spec parsing
+_FMT_USD0 = "${:.0f}".format
+_FMT_USD0_GROUPED = "${:,.0f}".format
+_FMT_USD2 = "${:.2f}".format
+_FMT_USD3 = "${:.3f}".format
+_FMT_USD4 = "${:.4f}".format
+_FMT_PCT2 = "{:.2f}%".format
+_FMT_SIZE = "{:,.2f}".format
+_FMT_SIGNED2 = "{:+.2f}".format
+# Cell style by sign, indexed with `value >= 0`
+_SIGN_STYLE = ("red", "green")
+
+
+def _use_tsv(output_format: str) -> bool:
+    """Resolve the --format option, auto-selecting TSV when stdout is not a terminal."""
+    if output_format == "auto":
+        return not _IS_TTY
+    return output_format == "tsv"
+
+
+# Tabs and line breaks inside a field would shift columns or split rows
+_TSV_FIELD_ESCAPES = str.maketrans({"\t": " ", "\n": " ", "\r": " "})
+
+
+def _print_tsv(headers: Sequence[str], rows: Iterable[Sequence[str]]) -> None:
+    """Write rows as tab-separated values, bypassing Rich rendering entirely.
+
+    Tabs and line breaks in field values (e.g. market questions) are
+    replaced with spaces so every row stays on one line.
+    """
+    out = sys.stdout
+    out.write("\t".join(headers) + "\n")
+    out.writelines(
+        "\t".join(field.translate(_TSV_FIELD_ESCAPES) for field in row) + "\n"
+        for row in rows
+    )
+
+
+_format_option = click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["auto", "table", "tsv"]),
+    default="auto",
+    help="Output format (auto: table on a terminal, TSV when piped)",
+)
+
+
+def _analyze_top(analyzer: Any, snapshots: Iterable[Any], k: int) -> list[Any]:
+    """Analyze snapshots, keeping only the k most profitable opportunities.
+
+    Opportunities are fed through a bounded min-heap as they are found, so
+    the full opportunity list is never materialized or sorted.
+    """
+    heap: list[tuple[Any, int, Any]] = []
+    for i, snapshot in enumerate(snapshots):
+        opportunity = analyzer.analyze(snapshot)
+        if opportunity is None:
+            continue
+        # -i keeps earlier snapshots ahead of later ones on equal profit
+        entry = (opportunity.profit_pct, -i, opportunity)
+        if len(heap) < k:
+            heapq.heappush(heap, entry)
+        else:
+            heapq.heappushpop(heap, entry)
+    return [opportunity for _, _, opportunity in sorted(heap, reverse=True)]
+
+
+@functools.cache
+def _portfolio_tracker() -> Any:
+    """Process-wide PortfolioTracker, built on first use."""
+    from rarb.tracking.portfolio import PortfolioTracker
+
+    return PortfolioTracker()
+
+
+@functools.cache
+def _trade_log() -> Any:
+    """Process-wide TradeLog, built on first use."""
+    from rarb.tracking.trades import TradeLog
+
+    return TradeLog()
+
+
+def _recent_trades_and_summary(limit: int) -> tuple[list[Any], dict]:
+    """Read the most recent trades and the all-time summary in one call.
+
+    Meant to be run in a worker thread so both trade log reads share a
+    single hop off the event loop. The TradeLog is opened on that thread
+    rather than shared with the loop thread, since its connection may not
+    be usable across threads.
+    """
+    from rarb.tracking.trades import TradeLog
+
+    trade_log = TradeLog()
+    return trade_log.get_trades(limit=limit), trade_log.get_all_time_summary()
+
+
+async def _run_until_signalled(main: Coroutine[Any, Any, None]) -> bool:
+    """Run a long-lived coroutine until it returns or SIGINT/SIGTERM arrives.
+
+    On a signal the task is cancelled, so its own cancellation/finally
+    handlers perform the shutdown. Platforms without loop signal handlers
+    fall back to the usual KeyboardInterrupt.
+
+    Returns:
+        True if the run was stopped by a signal
+    """
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    signals = (signal.SIGINT, signal.SIGTERM)
+    try:
+        for sig in signals:
+            loop.add_signal_handler(sig, stop.set)
+    except NotImplementedError:
+        await main
+        return False
+
+    main_task = asyncio.create_task(main)
+    stop_task = asyncio.create_task(stop.wait())
+    try:
+        await asyncio.wait({main_task, stop_task}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for sig in signals:
+            loop.remove_signal_handler(sig)
+        stop_task.cancel()
+
+    if not main_task.done():
+        main_task.cancel()
+        try:
+            await main_task
+        except asyncio.CancelledError:
+            pass
+    else:
+        main_task.result()
+    return stop.is_set()
+
+
+def _run_async(main: Coroutine[Any, Any, T]) -> T:
+    """Run a command's coroutine on a single event loop, using uvloop when installed."""
+    loop_factory = uvloop.new_event_loop if uvloop is not None else None
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        return runner.run(main)
 
 
 @click.group()
@@ -38,21 +209,16 @@ def run(
     log_level: str,
 ) -> None:
     """Run the arbitrage bot."""
-    import os
-
     # Override settings from CLI
-    if dry_run is not None:
-        os.environ["DRY_RUN"] = str(dry_run).lower()
+    overrides: dict[str, object] = {"dry_run": dry_run, "log_level": log_level}
     if poll_interval is not None:
-        os.environ["POLL_INTERVAL_SECONDS"] = str(poll_interval)
+        overrides["poll_interval_seconds"] = poll_interval
     if min_profit is not None:
-        os.environ["MIN_PROFIT_THRESHOLD"] = str(min_profit)
+        overrides["min_profit_threshold"] = min_profit
     if max_position is not None:
-        os.environ["MAX_POSITION_SIZE"] = str(max_position)
-    if log_level:
-        os.environ["LOG_LEVEL"] = log_level
+        overrides["max_position_size"] = max_position
 
-    reload_settings()
+    reload_settings(**overrides)
     setup_logging(log_level)
 
     settings = get_settings()
@@ -78,14 +244,16 @@ def run(
     console.print(f"[dim]Max position:[/dim] ${settings.max_position_size}")
     console.print()
 
+    if realtime:
+        from rarb.bot import run_realtime_bot as bot_main
+    else:
+        from rarb.bot import run_bot as bot_main
+
     try:
-        if realtime:
-            from rarb.bot import run_realtime_bot
-            asyncio.run(run_realtime_bot())
-        else:
-            from rarb.bot import run_bot
-            asyncio.run(run_bot())
+        interrupted = _run_async(_run_until_signalled(bot_main()))
     except KeyboardInterrupt:
+        interrupted = True
+    if interrupted:
         console.print("\n[yellow]Interrupted[/yellow]")
 
 
@@ -106,7 +274,7 @@ def scan() -> None:
             console.print(f"Found {len(snapshots)} active markets\n")
 
             analyzer = ArbitrageAnalyzer()
-            opportunities = analyzer.analyze_batch(snapshots)
+            opportunities = _analyze_top(analyzer, snapshots, 20)
 
             if not opportunities:
                 console.print("[yellow]No arbitrage opportunities found[/yellow]")
@@ -121,63 +289,86 @@ def scan() -> None:
             table.add_column("Profit %", justify="right", style="green")
             table.add_column("Max Size", justify="right")
 
-            for opp in opportunities[:20]:  # Top 20
+            for opp in opportunities:
                 table.add_row(
                     opp.market.question[:40],
-                    f"${float(opp.yes_ask):.3f}",
-                    f"${float(opp.no_ask):.3f}",
-                    f"${float(opp.combined_cost):.3f}",
-                    f"{float(opp.profit_pct) * 100:.2f}%",
-                    f"${float(opp.max_trade_size):.0f}",
+                    _FMT_USD3(float(opp.yes_ask)),
+                    _FMT_USD3(float(opp.no_ask)),
+                    _FMT_USD3(float(opp.combined_cost)),
+                    _FMT_PCT2(float(opp.profit_pct) * 100),
+                    _FMT_USD0(float(opp.max_trade_size)),
                 )
 
             console.print(table)
 
-    asyncio.run(_scan())
+    _run_async(_scan())
 
 
 @cli.command()
 @click.option("--limit", default=30, help="Maximum markets to show")
-def markets(limit: int) -> None:
+@_format_option
+def markets(limit: int, output_format: str) -> None:
     """List active markets."""
     setup_logging("WARNING")
+    use_tsv = _use_tsv(output_format)
 
     async def _markets() -> None:
         from rarb.api.gamma import GammaClient
 
-        console.print("[bold]Fetching markets...[/bold]\n")
+        if not use_tsv:
+            console.print("[bold]Fetching markets...[/bold]\n")
 
         async with GammaClient() as client:
             # Just fetch one page of markets
             raw_markets = await client.get_markets(active=True, limit=100)
-            markets = []
-            for raw in raw_markets:
-                m = client.parse_market(raw)
-                if m is not None:
-                    markets.append(m)
-
-            # Sort by volume
-            markets.sort(key=lambda m: m.volume, reverse=True)
+            parsed_count = 0
+
+            def parsed_markets():
+                nonlocal parsed_count
+                for raw in raw_markets:
+                    m = client.parse_market(raw)
+                    if m is not None:
+                        parsed_count += 1
+                        yield m
+
+            # Parse and keep only the top `limit` by volume in a single pass
+            top = heapq.nlargest(limit, parsed_markets(), key=attrgetter("volume"))
+
+            if use_tsv:
+                _print_tsv(
+                    ("Market", "Volume", "Liquidity", "YES", "NO"),
+                    (
+                        (
+                            market.question,
+                            _FMT_USD0_GROUPED(float(market.volume)),
+                            _FMT_USD0_GROUPED(float(market.liquidity)),
+                            _FMT_USD2(float(market.yes_price)),
+                            _FMT_USD2(float(market.no_price)),
+                        )
+                        for market in top
+                    ),
+                )
+                return
 
-            table = Table(title=f"Active Markets (showing {min(limit, len(markets))} of {len(markets)})")
+            table = Table(title=f"Active Markets (showing {len(top)} of {parsed_count})")
             table.add_column("Market", style="cyan", max_width=50)
             table.add_column("Volume", justify="right")
             table.add_column("Liquidity", justify="right")
             table.add_column("YES", justify="right")
             table.add_column("NO", justify="right")
 
-            for market in markets[:limit]:
+            for market in top:
                 table.add_row(
                     market.question[:50],
-                    f"${float(market.volume):,.0f}",
-                    f"${float(market.liquidity):,.0f}",
-                    f"${float(market.yes_price):.2f}",
-                    f"${float(market.no_price):.2f}",
+                    _FMT_USD0_GROUPED(float(market.volume)),
+                    _FMT_USD0_GROUPED(float(market.liquidity)),
+                    _FMT_USD2(float(market.yes_price)),
+                    _FMT_USD2(float(market.no_price)),
                 )
 
             console.print(table)
 
-    asyncio.run(_markets())
+    _run_async(_markets())
 
 
 @cli.command()
@@ -199,6 +390,7 @@ def config() -> None:
     # Network
     table.add_row("Polygon RPC", settings.polygon_rpc_url[:50])
     table.add_row("Chain ID", str(settings.chain_id))
+    table.add_row("Event Loop", "uvloop" if uvloop is not None else "asyncio")
 
     # Credentials
     wallet = settings.wallet_address or "[not set]"
@@ -232,16 +424,16 @@ def orderbook(token_id: str) -> None:
             bid_table.add_column("Price", justify="right", style="green")
             bid_table.add_column("Size", justify="right")
 
-            for level in sorted(ob.bids, key=lambda x: x.price, reverse=True)[:10]:
-                bid_table.add_row(f"${float(level.price):.4f}", f"{float(level.size):,.2f}")
+            for level in heapq.nlargest(10, ob.bids, key=_by_price):
+                bid_table.add_row(_FMT_USD4(float(level.price)), _FMT_SIZE(float(level.size)))
 
             # Asks
             ask_table = Table(title="Asks (Sell Orders)")
             ask_table.add_column("Price", justify="right", style="red")
             ask_table.add_column("Size", justify="right")
 
-            for level in sorted(ob.asks, key=lambda x: x.price)[:10]:
-                ask_table.add_row(f"${float(level.price):.4f}", f"{float(level.size):,.2f}")
+            for level in heapq.nsmallest(10, ob.asks, key=_by_price):
+                ask_table.add_row(_FMT_USD4(float(level.price)), _FMT_SIZE(float(level.size)))
 
             console.print(bid_table)
             console.print()
@@ -249,12 +441,16 @@ def orderbook(token_id: str) -> None:
 
             # Summary
             if ob.best_bid and ob.best_ask:
-                spread = ob.best_ask - ob.best_bid
-                console.print(f"\n[dim]Best Bid:[/dim] ${float(ob.best_bid):.4f}")
-                console.print(f"[dim]Best Ask:[/dim] ${float(ob.best_ask):.4f}")
-                console.print(f"[dim]Spread:[/dim] ${float(spread):.4f} ({float(spread / ob.best_ask) * 100:.2f}%)")
+                # Display-only values, so plain floats are precise enough
+                best_bid, best_ask = float(ob.best_bid), float(ob.best_ask)
+                spread = best_ask - best_bid
+                console.print(f"\n[dim]Best Bid:[/dim] {_FMT_USD4(best_bid)}")
+                console.print(f"[dim]Best Ask:[/dim] {_FMT_USD4(best_ask)}")
+                console.print(
+                    f"[dim]Spread:[/dim] {_FMT_USD4(spread)} ({_FMT_PCT2(spread / best_ask * 100)})"
+                )
 
-    asyncio.run(_orderbook())
+    _run_async(_orderbook())
 
 
 @cli.command()
@@ -269,12 +465,7 @@ def crossplatform(
     log_level: str,
 ) -> None:
     """Run cross-platform arbitrage scanner (Polymarket vs Kalshi)."""
-    import os
-
-    if dry_run is not None:
-        os.environ["DRY_RUN"] = str(dry_run).lower()
-
-    reload_settings()
+    reload_settings(dry_run=dry_run)
     setup_logging(log_level)
 
     settings = get_settings()
@@ -305,8 +496,10 @@ def crossplatform(
             await scanner.run()
 
     try:
-        asyncio.run(_run())
+        interrupted = _run_async(_run_until_signalled(_run()))
     except KeyboardInterrupt:
+        interrupted = True
+    if interrupted:
         console.print("\n[yellow]Interrupted[/yellow]")
 
 
@@ -330,7 +523,7 @@ def kalshi_test() -> None:
                 # Test balance
                 balance = await client.get_balance()
                 console.print(f"[green]✓[/green] Connected to Kalshi")
-                console.print(f"[dim]Account balance:[/dim] ${float(balance):.2f}\n")
+                console.print(f"[dim]Account balance:[/dim] {_FMT_USD2(float(balance))}\n")
 
                 # Fetch some markets
                 markets = await client.get_markets(limit=10)
@@ -347,8 +540,8 @@ def kalshi_test() -> None:
                         table.add_row(
                             m.ticker,
                             m.title[:40],
-                            f"${float(m.yes_bid):.2f}" if m.yes_bid else "-",
-                            f"${float(m.yes_ask):.2f}" if m.yes_ask else "-",
+                            _FMT_USD2(float(m.yes_bid)) if m.yes_bid else "-",
+                            _FMT_USD2(float(m.yes_ask)) if m.yes_ask else "-",
                         )
 
                     console.print(table)
@@ -356,7 +549,7 @@ def kalshi_test() -> None:
             except Exception as e:
                 console.print(f"[red]✗ Connection failed:[/red] {e}")
 
-    asyncio.run(_test())
+    _run_async(_test())
 
 
 @cli.command()
@@ -399,15 +592,15 @@ def crossplatform_scan() -> None:
                 table.add_row(
                     opp.match.polymarket.question[:30],
                     opp.match.kalshi.ticker,
-                    f"${float(opp.poly_price):.2f}",
-                    f"${float(opp.kalshi_price):.2f}",
+                    _FMT_USD2(float(opp.poly_price)),
+                    _FMT_USD2(float(opp.kalshi_price)),
                     f"{float(opp.spread_pct) * 100:.1f}%",
                     opp.direction.replace("_", " "),
                 )
 
             console.print(table)
 
-    asyncio.run(_scan())
+    _run_async(_scan())
 
 
 @cli.command()
@@ -416,30 +609,14 @@ def status() -> None:
     setup_logging("WARNING")
 
     async def _status() -> None:
-        from rarb.tracking.portfolio import PortfolioTracker
-        from rarb.tracking.trades import TradeLog
-
         settings = get_settings()
-        tracker = PortfolioTracker()
-        trade_log = TradeLog()
-
-        console.print("\n[bold]rarb Bot Status[/bold]\n")
-
-        # Current balances
-        console.print("[bold cyan]Balances[/bold cyan]")
-        balances = await tracker.get_current_balances()
+        tracker = _portfolio_tracker()
 
-        balance_table = Table(show_header=False, box=None)
-        balance_table.add_column("Platform", style="dim")
-        balance_table.add_column("Balance", justify="right")
-
-        if balances["polymarket_usdc"] > 0:
-            balance_table.add_row("Polymarket (USDC)", f"${balances['polymarket_usdc']:.2f}")
-        if balances["kalshi_usd"] > 0:
-            balance_table.add_row("Kalshi (USD)", f"${balances['kalshi_usd']:.2f}")
-
-        balance_table.add_row("[bold]Total[/bold]", f"[bold]${balances['total_usd']:.2f}[/bold]")
-        console.print(balance_table)
+        # Balances are a network round trip, the trade log is local disk - overlap them
+        balances, (trades, summary) = await asyncio.gather(
+            tracker.get_current_balances(),
+            asyncio.to_thread(_recent_trades_and_summary, 10),
+        )
 
         # Record snapshot
         from rarb.tracking.portfolio import BalanceSnapshot
@@ -451,57 +628,78 @@ def status() -> None:
         )
         tracker.record_snapshot(snapshot)
 
-        console.print()
+        # Render everything into Rich's buffer and write it out once
+        with console:
+            console.print("\n[bold]rarb Bot Status[/bold]\n")
 
-        # Recent trades
-        console.print("[bold cyan]Recent Trades[/bold cyan]")
-        trades = trade_log.get_trades(limit=10)
+            # Current balances
+            console.print("[bold cyan]Balances[/bold cyan]")
 
-        if not trades:
-            console.print("[dim]No trades recorded yet[/dim]")
-        else:
-            trade_table = Table()
-            trade_table.add_column("Time", style="dim")
-            trade_table.add_column("Platform")
-            trade_table.add_column("Market", max_width=25)
-            trade_table.add_column("Side")
-            trade_table.add_column("Price", justify="right")
-            trade_table.add_column("Size", justify="right")
-
-            for t in trades:
-                time_str = t.timestamp.split("T")[1][:8] if "T" in t.timestamp else t.timestamp
-                side_color = "green" if t.side == "buy" else "red"
-                trade_table.add_row(
-                    time_str,
-                    t.platform,
-                    t.market_name[:25],
-                    f"[{side_color}]{t.side.upper()} {t.outcome.upper()}[/{side_color}]",
-                    f"${t.price:.3f}",
-                    f"${t.size:.2f}",
-                )
+            balance_table = Table(show_header=False, box=None)
+            balance_table.add_column("Platform", style="dim")
+            balance_table.add_column("Balance", justify="right")
 
-            console.print(trade_table)
+            if balances["polymarket_usdc"] > 0:
+                balance_table.add_row("Polymarket (USDC)", _FMT_USD2(balances["polymarket_usdc"]))
+            if balances["kalshi_usd"] > 0:
+                balance_table.add_row("Kalshi (USD)", _FMT_USD2(balances["kalshi_usd"]))
 
-        console.print()
+            balance_table.add_row(
+                "[bold]Total[/bold]", f"[bold]{_FMT_USD2(balances['total_usd'])}[/bold]"
+            )
+            console.print(balance_table)
 
-        # Trading summary
-        console.print("[bold cyan]Summary[/bold cyan]")
-        summary = trade_log.get_all_time_summary()
+            console.print()
 
-        if summary["trade_count"] > 0:
-            console.print(f"[dim]Total trades:[/dim] {summary['trade_count']}")
-            console.print(f"[dim]Total cost:[/dim] ${summary['total_cost']:.2f}")
-            console.print(f"[dim]Expected profit:[/dim] ${summary['expected_profit']:.2f}")
-        else:
-            console.print("[dim]No trading activity yet[/dim]")
+            # Recent trades
+            console.print("[bold cyan]Recent Trades[/bold cyan]")
 
-        console.print()
+            if not trades:
+                console.print("[dim]No trades recorded yet[/dim]")
+            else:
+                trade_table = Table()
+                trade_table.add_column("Time", style="dim")
+                trade_table.add_column("Platform")
+                trade_table.add_column("Market", max_width=25)
+                trade_table.add_column("Side")
+                trade_table.add_column("Price", justify="right")
+                trade_table.add_column("Size", justify="right")
+
+                for t in trades:
+                    time_str = t.timestamp.split("T")[1][:8] if "T" in t.timestamp else t.timestamp
+                    side_color = "green" if t.side == "buy" else "red"
+                    trade_table.add_row(
+                        time_str,
+                        t.platform,
+                        t.market_name[:25],
+                        f"[{side_color}]{t.side.upper()} {t.outcome.upper()}[/{side_color}]",
+                        _FMT_USD3(t.price),
+                        _FMT_USD2(t.size),
+                    )
+
+                console.print(trade_table)
+
+            console.print()
+
+            # Trading summary
+            console.print("[bold cyan]Summary[/bold cyan]")
+
+            if summary["trade_count"] > 0:
+                console.print(f"[dim]Total trades:[/dim] {summary['trade_count']}")
+                console.print(f"[dim]Total cost:[/dim] {_FMT_USD2(summary['total_cost'])}")
+                console.print(
+                    f"[dim]Expected profit:[/dim] {_FMT_USD2(summary['expected_profit'])}"
+                )
+            else:
+                console.print("[dim]No trading activity yet[/dim]")
 
-        # Mode
-        mode = "[yellow]DRY RUN[/yellow]" if settings.dry_run else "[red]LIVE[/red]"
-        console.print(f"[dim]Mode:[/dim] {mode}")
+            console.print()
 
-    asyncio.run(_status())
+            # Mode
+            mode = "[yellow]DRY RUN[/yellow]" if settings.dry_run else "[red]LIVE[/red]"
+            console.print(f"[dim]Mode:[/dim] {mode}")
+
+    _run_async(_status())
 
 
 @cli.command()
@@ -510,9 +708,7 @@ def balance() -> None:
     setup_logging("WARNING")
 
     async def _balance() -> None:
-        from rarb.tracking.portfolio import PortfolioTracker
-
-        tracker = PortfolioTracker()
+        tracker = _portfolio_tracker()
         console.print("\n[bold]Fetching balances...[/bold]\n")
 
         balances = await tracker.get_current_balances()
@@ -523,15 +719,15 @@ def balance() -> None:
         table.add_column("Currency")
 
         if balances["polymarket_usdc"] > 0 or True:  # Always show
-            table.add_row("Polymarket", f"${balances['polymarket_usdc']:.2f}", "USDC")
+            table.add_row("Polymarket", _FMT_USD2(balances["polymarket_usdc"]), "USDC")
 
         if balances["kalshi_usd"] > 0 or True:  # Always show
-            table.add_row("Kalshi", f"${balances['kalshi_usd']:.2f}", "USD")
+            table.add_row("Kalshi", _FMT_USD2(balances["kalshi_usd"]), "USD")
 
         console.print(table)
-        console.print(f"\n[bold]Total:[/bold] ${balances['total_usd']:.2f}")
+        console.print(f"\n[bold]Total:[/bold] {_FMT_USD2(balances['total_usd'])}")
 
-    asyncio.run(_balance())
+    _run_async(_balance())
 
 
 @cli.command()
@@ -556,6 +752,7 @@ def approve_redemption() -> None:
     console.print(f"Wallet: {settings.wallet_address}")
 
     try:
+        from eth_abi import decode, encode
         from web3 import Web3
 
         # Polymarket contracts on Polygon
@@ -564,35 +761,16 @@ def approve_redemption() -> None:
         CTF_EXCHANGE = "0x4bFb41d5B3570DeFd03C39a9A4D8dE6Bd8B8982E"
         NEG_RISK_ADAPTER = "0xd91E80cF2E7be2e162c6513ceD06f1dD0dA35296"
 
-        # ERC1155 setApprovalForAll ABI
-        APPROVAL_ABI = [
-            {
-                "inputs": [
-                    {"name": "operator", "type": "address"},
-                    {"name": "approved", "type": "bool"}
-                ],
-                "name": "setApprovalForAll",
-                "outputs": [],
-                "stateMutability": "nonpayable",
-                "type": "function"
-            },
-            {
-                "inputs": [
-                    {"name": "account", "type": "address"},
-                    {"name": "operator", "type": "address"}
-                ],
-                "name": "isApprovedForAll",
-                "outputs": [{"name": "", "type": "bool"}],
-                "stateMutability": "view",
-                "type": "function"
-            }
-        ]
+        # ERC1155 function selectors - calldata is encoded directly instead of
+        # going through web3's contract ABI machinery on every call
+        SET_APPROVAL_SELECTOR = Web3.keccak(text="setApprovalForAll(address,bool)")[:4]
+        IS_APPROVED_SELECTOR = Web3.keccak(text="isApprovedForAll(address,address)")[:4]
 
         w3 = Web3(Web3.HTTPProvider(settings.polygon_rpc_url))
         wallet = Web3.to_checksum_address(settings.wallet_address)
         private_key = settings.private_key.get_secret_value()
 
-        ctf = w3.eth.contract(address=Web3.to_checksum_address(CTF_ADDRESS), abi=APPROVAL_ABI)
+        ctf = Web3.to_checksum_address(CTF_ADDRESS)
 
         operators = [
             ("NegRiskCTFExchange", NEG_RISK_CTF_EXCHANGE),
@@ -604,7 +782,11 @@ def approve_redemption() -> None:
             operator = Web3.to_checksum_address(operator_addr)
 
             # Check if already approved
-            is_approved = ctf.functions.isApprovedForAll(wallet, operator).call()
+            result = w3.eth.call({
+                "to": ctf,
+                "data": IS_APPROVED_SELECTOR + encode(["address", "address"], [wallet, operator]),
+            })
+            (is_approved,) = decode(["bool"], result)
 
             if is_approved:
                 console.print(f"[green]✓[/green] {name}: Already approved")
@@ -616,13 +798,16 @@ def approve_redemption() -> None:
             nonce = w3.eth.get_transaction_count(wallet)
             gas_price = w3.eth.gas_price
 
-            tx = ctf.functions.setApprovalForAll(operator, True).build_transaction({
+            tx = {
                 'from': wallet,
+                'to': ctf,
+                'data': SET_APPROVAL_SELECTOR + encode(["address", "bool"], [operator, True]),
+                'value': 0,
                 'nonce': nonce,
                 'gas': 100000,
                 'gasPrice': int(gas_price * 1.1),  # 10% buffer
                 'chainId': 137,
-            })
+            }
 
             signed = w3.eth.account.sign_transaction(tx, private_key)
             tx_hash = w3.eth.send_raw_transaction(signed.raw_transaction)
@@ -647,13 +832,30 @@ def approve_redemption() -> None:
 @cli.command()
 @click.option("--limit", default=20, help="Number of trades to show")
 @click.option("--platform", type=click.Choice(["polymarket", "kalshi"]), help="Filter by platform")
-def trades(limit: int, platform: Optional[str]) -> None:
+@_format_option
+def trades(limit: int, platform: Optional[str], output_format: str) -> None:
     """Show trade history."""
-    from rarb.tracking.trades import TradeLog
-
-    trade_log = TradeLog()
+    trade_log = _trade_log()
     recent = trade_log.get_trades(limit=limit, platform=platform)
 
+    if _use_tsv(output_format):
+        _print_tsv(
+            ("Time", "Platform", "Market", "Action", "Price", "Size", "Expected P/L"),
+            (
+                (
+                    t.timestamp,
+                    t.platform,
+                    t.market_name,
+                    f"{t.side.upper()} {t.outcome.upper()}",
+                    _FMT_USD3(t.price),
+                    _FMT_USD2(t.size),
+                    _FMT_USD2(t.profit_expected) if t.profit_expected else "-",
+                )
+                for t in recent
+            ),
+        )
+        return
+
     if not recent:
         console.print("\n[yellow]No trades recorded yet[/yellow]\n")
         return
@@ -670,15 +872,15 @@ def trades(limit: int, platform: Optional[str]) -> None:
     for t in recent:
         time_str = t.timestamp.split("T")[0] + " " + t.timestamp.split("T")[1][:8] if "T" in t.timestamp else t.timestamp
         side_color = "green" if t.side == "buy" else "red"
-        pl_str = f"${t.profit_expected:.2f}" if t.profit_expected else "-"
+        pl_str = _FMT_USD2(t.profit_expected) if t.profit_expected else "-"
 
         table.add_row(
             time_str,
             t.platform,
             t.market_name[:30],
             f"[{side_color}]{t.side.upper()} {t.outcome.upper()}[/{side_color}]",
-            f"${t.price:.3f}",
-            f"${t.size:.2f}",
+            _FMT_USD3(t.price),
+            _FMT_USD2(t.size),
             pl_str,
         )
 
@@ -687,39 +889,37 @@ def trades(limit: int, platform: Optional[str]) -> None:
     # Summary
     summary = trade_log.get_all_time_summary()
     console.print(f"\n[dim]Total trades:[/dim] {summary['trade_count']}")
-    console.print(f"[dim]Total invested:[/dim] ${summary['total_cost']:.2f}")
-    console.print(f"[dim]Expected profit:[/dim] ${summary['expected_profit']:.2f}")
+    console.print(f"[dim]Total invested:[/dim] {_FMT_USD2(summary['total_cost'])}")
+    console.print(f"[dim]Expected profit:[/dim] {_FMT_USD2(summary['expected_profit'])}")
 
 
 @cli.command()
 def pnl() -> None:
     """Show profit/loss summary."""
-    from datetime import datetime, timedelta
-    from rarb.tracking.portfolio import PortfolioTracker
-    from rarb.tracking.trades import TradeLog
+    trade_log = _trade_log()
 
-    tracker = PortfolioTracker()
-    trade_log = TradeLog()
+    today_summary = trade_log.get_daily_summary()
+    all_time = trade_log.get_all_time_summary()
 
-    console.print("\n[bold]Profit & Loss Summary[/bold]\n")
+    # Render everything into Rich's buffer and write it out once
+    with console:
+        console.print("\n[bold]Profit & Loss Summary[/bold]\n")
 
-    # Today's trades
-    today_summary = trade_log.get_daily_summary()
-    console.print("[bold cyan]Today[/bold cyan]")
-    console.print(f"  Trades: {today_summary['trade_count']}")
-    console.print(f"  Cost: ${today_summary['total_cost']:.2f}")
-    console.print(f"  Expected profit: ${today_summary['expected_profit']:.2f}")
-    console.print()
+        # Today's trades
+        console.print("[bold cyan]Today[/bold cyan]")
+        console.print(f"  Trades: {today_summary['trade_count']}")
+        console.print(f"  Cost: {_FMT_USD2(today_summary['total_cost'])}")
+        console.print(f"  Expected profit: {_FMT_USD2(today_summary['expected_profit'])}")
+        console.print()
 
-    # All-time
-    all_time = trade_log.get_all_time_summary()
-    console.print("[bold cyan]All Time[/bold cyan]")
-    console.print(f"  Total trades: {all_time['trade_count']}")
-    console.print(f"  Total invested: ${all_time['total_cost']:.2f}")
-    console.print(f"  Expected profit: ${all_time['expected_profit']:.2f}")
+        # All-time
+        console.print("[bold cyan]All Time[/bold cyan]")
+        console.print(f"  Total trades: {all_time['trade_count']}")
+        console.print(f"  Total invested: {_FMT_USD2(all_time['total_cost'])}")
+        console.print(f"  Expected profit: {_FMT_USD2(all_time['expected_profit'])}")
 
-    if all_time['first_trade']:
-        console.print(f"  First trade: {all_time['first_trade'][:10]}")
+        if all_time['first_trade']:
+            console.print(f"  First trade: {all_time['first_trade'][:10]}")
 
 
 @cli.command()
@@ -759,11 +959,11 @@ def redeem() -> None:
                 p.get("title", "Unknown")[:40],
                 p.get("outcome", "?"),
                 str(p.get("size", 0)),
-                f"${value:.2f}",
+                _FMT_USD2(value),
             )
 
         console.print(table)
-        console.print(f"\n[bold]Total to redeem:[/bold] ${total_value:.2f}\n")
+        console.print(f"\n[bold]Total to redeem:[/bold] {_FMT_USD2(total_value)}\n")
 
         # Confirm
         if settings.dry_run:
@@ -784,9 +984,9 @@ def redeem() -> None:
         console.print(f"[green]Successfully redeemed:[/green] {result['redeemed']} positions")
         if result.get("failed"):
             console.print(f"[red]Failed:[/red] {result['failed']} positions")
-        console.print(f"[bold]Total value:[/bold] ${result['total_value']:.2f}")
+        console.print(f"[bold]Total value:[/bold] {_FMT_USD2(result['total_value'])}")
 
-    asyncio.run(_redeem())
+    _run_async(_redeem())
 
 
 @cli.command()
@@ -816,9 +1016,36 @@ def positions() -> None:
             console.print("[yellow]No positions found[/yellow]")
             return
 
+        # Split open vs redeemable positions and build their rows in one pass
+        open_rows = []
+        redeemable_rows = []
+        total_value = 0.0
+        for p in positions:
+            size = p.get("size", 0)
+            if float(size) <= 0:
+                continue
+            title = p.get("title", "Unknown")[:40]
+            outcome = p.get("outcome", "?")
+            pnl = float(p.get("cashPnl", 0))
+            # Styled Text skips Rich's markup parser when the table renders
+            pnl_cell = Text(_FMT_USD2(pnl), style=_SIGN_STYLE[pnl >= 0])
+
+            if p.get("redeemable"):
+                value = float(p.get("currentValue", 0))
+                total_value += value
+                redeemable_rows.append((title, outcome, str(size), _FMT_USD2(value), pnl_cell))
+            else:
+                open_rows.append((
+                    title,
+                    outcome,
+                    str(size),
+                    _FMT_USD3(float(p.get("avgPrice", 0))),
+                    _FMT_USD3(float(p.get("curPrice", 0))),
+                    pnl_cell,
+                ))
+
         # Open positions
-        open_positions = [p for p in positions if not p.get("redeemable") and float(p.get("size", 0)) > 0]
-        if open_positions:
+        if open_rows:
             table = Table(title="Open Positions")
             table.add_column("Market", max_width=40)
             table.add_column("Outcome")
@@ -827,24 +1054,14 @@ def positions() -> None:
             table.add_column("Current", justify="right")
             table.add_column("P&L", justify="right")
 
-            for p in open_positions:
-                pnl = float(p.get("cashPnl", 0))
-                pnl_color = "green" if pnl >= 0 else "red"
-                table.add_row(
-                    p.get("title", "Unknown")[:40],
-                    p.get("outcome", "?"),
-                    str(p.get("size", 0)),
-                    f"${float(p.get('avgPrice', 0)):.3f}",
-                    f"${float(p.get('curPrice', 0)):.3f}",
-                    f"[{pnl_color}]${pnl:.2f}[/{pnl_color}]",
-                )
+            for row in open_rows:
+                table.add_row(*row)
 
             console.print(table)
             console.print()
 
         # Redeemable positions
-        redeemable = [p for p in positions if p.get("redeemable") and float(p.get("size", 0)) > 0]
-        if redeemable:
+        if redeemable_rows:
             table = Table(title="Redeemable Positions (Resolved)")
             table.add_column("Market", max_width=40)
             table.add_column("Outcome")
@@ -852,25 +1069,14 @@ def positions() -> None:
             table.add_column("Value", justify="right")
             table.add_column("P&L", justify="right")
 
-            total_value = 0
-            for p in redeemable:
-                value = float(p.get("currentValue", 0))
-                total_value += value
-                pnl = float(p.get("cashPnl", 0))
-                pnl_color = "green" if pnl >= 0 else "red"
-                table.add_row(
-                    p.get("title", "Unknown")[:40],
-                    p.get("outcome", "?"),
-                    str(p.get("size", 0)),
-                    f"${value:.2f}",
-                    f"[{pnl_color}]${pnl:.2f}[/{pnl_color}]",
-                )
+            for row in redeemable_rows:
+                table.add_row(*row)
 
             console.print(table)
-            console.print(f"\n[bold]Total redeemable:[/bold] ${total_value:.2f}")
+            console.print(f"\n[bold]Total redeemable:[/bold] {_FMT_USD2(total_value)}")
             console.print("[dim]Run 'rarb redeem' to claim these positions[/dim]")
 
-    asyncio.run(_positions())
+    _run_async(_positions())
 
 
 @cli.command()
@@ -879,8 +1085,10 @@ def positions() -> None:
 def backfill_balance(polygonscan_api_key: Optional[str], dry_run: bool) -> None:
     """Backfill historical balance data from on-chain USDC transfers."""
     import httpx
-    from datetime import datetime
+    from datetime import datetime, timezone
     from collections import defaultdict
+    from itertools import accumulate
+    from operator import itemgetter
 
     settings = get_settings()
 
@@ -900,81 +1108,142 @@ def backfill_balance(polygonscan_api_key: Optional[str], dry_run: bool) -> None:
         console.print(f"\n[bold]Fetching USDC transfers from Polygonscan...[/bold]")
         console.print(f"[dim]Wallet: {wallet}[/dim]\n")
 
-        # Fetch all USDC transfers
+        # Fetch all USDC transfers. Etherscan caps page * offset at 10k rows.
+        # Pages are fetched one at a time: the free tier rate-limits bursts,
+        # and a refused page must not be mistaken for the end of the history
+        page_size = 1000
+        max_pages = 10
+        max_attempts = 4
+        params = {
+            "chainid": "137",
+            "module": "account",
+            "action": "tokentx",
+            "contractaddress": usdc_bridged,
+            "address": wallet,
+            "offset": str(page_size),
+            "sort": "asc",
+            "apikey": polygonscan_api_key,
+        }
+
+        async def fetch_page(client: httpx.AsyncClient, page: int) -> Optional[list]:
+            """Transfers on one page ([] past the end), or None if the API keeps failing."""
+            error = "Unknown error"
+            for attempt in range(max_attempts):
+                if attempt:
+                    await asyncio.sleep(2 ** (attempt - 1))
+                try:
+                    resp = await client.get(
+                        "https://api.etherscan.io/v2/api",
+                        params={**params, "page": str(page)},
+                    )
+                    resp.raise_for_status()
+                    data = _json_loads(resp.content)
+                except (httpx.HTTPError, ValueError) as e:
+                    error = str(e)
+                    continue
+                if data.get("status") == "1":
+                    return data.get("result", [])
+                if data.get("message") == "No transactions found":
+                    return []
+                # Rate limits and other failures also come back as status "0"
+                error = data.get("result") or data.get("message") or error
+            console.print(f"[red]API Error:[/red] page {page}: {error}")
+            return None
+
+        txs = []
         async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"https://api.etherscan.io/v2/api",
-                params={
-                    "chainid": "137",
-                    "module": "account",
-                    "action": "tokentx",
-                    "contractaddress": usdc_bridged,
-                    "address": wallet,
-                    "page": "1",
-                    "offset": "1000",
-                    "sort": "asc",
-                    "apikey": polygonscan_api_key,
-                },
-            )
-            data = resp.json()
-
-        if data.get("status") != "1":
-            console.print(f"[red]API Error:[/red] {data.get('message', 'Unknown error')}")
-            return
+            for page in range(1, max_pages + 1):
+                result = await fetch_page(client, page)
+                if result is None:
+                    console.print("[red]Backfill aborted:[/red] transfer history is incomplete")
+                    return
+                txs.extend(result)
+                if len(result) < page_size:
+                    break
+            else:
+                # Later transfers are missing, so recent balances would be wrong
+                limit = max_pages * page_size
+                if not dry_run:
+                    console.print(
+                        f"[red]Backfill aborted:[/red] reached the {limit} transfer limit; "
+                        "transfer history is incomplete"
+                    )
+                    return
+                console.print(
+                    f"[yellow]Warning:[/yellow] reached the {limit} transfer limit; "
+                    "later transfers are missing and recent balances will be wrong"
+                )
 
-        txs = data.get("result", [])
         console.print(f"Found [bold]{len(txs)}[/bold] USDC transfers\n")
 
+        # Transfers cluster on a handful of days, so format each UTC day once
+        @functools.cache
+        def utc_day(day: int) -> str:
+            return datetime.fromtimestamp(day * 86400, timezone.utc).strftime("%Y-%m-%d")
+
         # Calculate daily balance changes
         daily_changes: dict[str, float] = defaultdict(float)
-        for tx in txs:
-            ts = int(tx["timeStamp"])
-            date = datetime.utcfromtimestamp(ts).strftime("%Y-%m-%d")
-            amount = int(tx["value"]) / 1e6
-
-            if tx["to"].lower() == wallet:
+        # Pull the four fields per transfer in one C call, then lowercase the
+        # counterparties up front rather than per comparison
+        columns = zip(*map(itemgetter("timeStamp", "value", "to", "from"), txs))
+        timestamps, values, to_addrs, from_addrs = columns if txs else ((), (), (), ())
+        for ts_s, value_s, to_addr, from_addr in zip(
+            timestamps, values, map(str.lower, to_addrs), map(str.lower, from_addrs)
+        ):
+            date = utc_day(int(ts_s) // 86400)
+            amount = int(value_s) / 1e6
+
+            if to_addr == wallet:
                 daily_changes[date] += amount  # incoming
-            elif tx["from"].lower() == wallet:
+            elif from_addr == wallet:
                 daily_changes[date] -= amount  # outgoing
 
         # Calculate cumulative balance for each day
         from rarb.data.repositories import PortfolioRepository
 
-        balance = 0.0
         inserted = 0
 
+        # Running end-of-day balance via a prefix sum over the sorted days
+        days = sorted(daily_changes.items())
+        balances = list(accumulate(change for _, change in days))
+
+        if not dry_run:
+            # Insert the snapshots concurrently, bounded so the DB isn't flooded
+            semaphore = asyncio.Semaphore(16)
+
+            async def insert_day(date: str, balance: float) -> None:
+                async with semaphore:
+                    await PortfolioRepository.insert(
+                        timestamp=f"{date}T23:59:59",  # end of day
+                        polymarket_usdc=balance,
+                        total_usd=balance,  # USDC only, no positions data
+                        positions_value=0.0,
+                    )
+
+            await asyncio.gather(*(
+                insert_day(date, balance) for (date, _), balance in zip(days, balances)
+            ))
+            inserted = len(days)
+
+        status = "[yellow]would insert[/yellow]" if dry_run else "[green]inserted[/green]"
+        rows = [
+            (
+                date,
+                Text(_FMT_SIGNED2(change), style=_SIGN_STYLE[change >= 0]),
+                _FMT_USD2(balance),
+                status,
+            )
+            for (date, change), balance in zip(days, balances)
+        ]
+
         table = Table(title="Daily Balance History")
         table.add_column("Date")
         table.add_column("Change", justify="right")
         table.add_column("Balance", justify="right")
         table.add_column("Status")
 
-        for date in sorted(daily_changes.keys()):
-            change = daily_changes[date]
-            balance += change
-
-            # Create end-of-day timestamp
-            timestamp = f"{date}T23:59:59"
-
-            if dry_run:
-                status = "[yellow]would insert[/yellow]"
-            else:
-                await PortfolioRepository.insert(
-                    timestamp=timestamp,
-                    polymarket_usdc=balance,
-                    total_usd=balance,  # USDC only, no positions data
-                    positions_value=0.0,
-                )
-                inserted += 1
-                status = "[green]inserted[/green]"
-
-            change_color = "green" if change >= 0 else "red"
-            table.add_row(
-                date,
-                f"[{change_color}]{change:+.2f}[/{change_color}]",
-                f"${balance:.2f}",
-                status,
-            )
+        for row in rows:
+            table.add_row(*row)
 
         console.print(table)
 
@@ -983,7 +1252,7 @@ def backfill_balance(polygonscan_api_key: Optional[str], dry_run: bool) -> None:
         else:
             console.print(f"\n[green]Success:[/green] Inserted {inserted} daily balance snapshots")
 
-    asyncio.run(_backfill())
+    _run_async(_backfill())
 
 
 @cli.command()
@@ -1,11 +1,16 @@
 """Configuration management for rarb."""
 
+import os
+import re
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 from pydantic import Field, SecretStr, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+_WALLET_ADDRESS_RE = re.compile(r"0x[0-9a-fA-F]{40}")
+_PRIVATE_KEY_RE = re.compile(r"0x[0-9a-fA-F]{64}")
+
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
@@ -159,7 +164,7 @@ class Settings(BaseSettings):
     def validate_wallet_address(cls, v: Optional[str]) -> Optional[str]:
         if v is None or v == "":
             return None
-        if not v.startswith("0x") or len(v) != 42:
+        if not _WALLET_ADDRESS_RE.fullmatch(v):
             raise ValueError("Wallet address must be a valid Ethereum address (0x + 40 hex chars)")
         return v.lower()
 
@@ -168,9 +173,9 @@ class Settings(BaseSettings):
     def validate_private_key(cls, v: Optional[str]) -> Optional[str]:
         if v is None or v == "":
             return None
-        if not v.startswith("0x"):
-            raise ValueError("Private key must start with 0x")
-        if len(v) != 66:  # 0x + 64 hex chars
+        if not _PRIVATE_KEY_RE.fullmatch(v):
+            if not v.startswith("0x"):
+                raise ValueError("Private key must start with 0x")
             raise ValueError("Private key must be 32 bytes (64 hex chars + 0x prefix)")
         return v
 
@@ -202,18 +207,43 @@ class Settings(BaseSettings):
 
 # Global settings instance
 _settings: Optional[Settings] = None
+# Fingerprint of the inputs _settings was built from
+_settings_signature: Optional[tuple] = None
+
+
+def _settings_inputs_signature() -> tuple:
+    """Fingerprint the inputs Settings() reads: matching env vars and the .env file."""
+    fields = Settings.model_fields
+    env = tuple(sorted(
+        (key.lower(), value) for key, value in os.environ.items() if key.lower() in fields
+    ))
+    try:
+        env_file_mtime = os.stat(Settings.model_config["env_file"]).st_mtime_ns
+    except OSError:
+        env_file_mtime = None
+    return env, env_file_mtime
 
 
 def get_settings() -> Settings:
     """Get the global settings instance."""
-    global _settings
+    global _settings, _settings_signature
     if _settings is None:
+        _settings_signature = (_settings_inputs_signature(), ())
         _settings = Settings()
     return _settings
 
 
-def reload_settings() -> Settings:
-    """Reload settings from environment."""
-    global _settings
-    _settings = Settings()
+def reload_settings(**overrides: Any) -> Settings:
+    """Reload settings from environment.
+
+    Keyword arguments override individual fields (by field name) and take
+    precedence over environment variables and the .env file. Re-parsing is
+    skipped when neither the overrides, the relevant environment variables
+    nor the .env file changed since the settings were last built.
+    """
+    global _settings, _settings_signature
+    signature = (_settings_inputs_signature(), tuple(sorted(overrides.items())))
+    if _settings is None or signature != _settings_signature:
+        _settings_signature = signature
+        _settings = Settings(**overrides)
     return _settings
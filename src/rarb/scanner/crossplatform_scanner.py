@@ -1,9 +1,12 @@
 """Cross-platform scanner for Polymarket vs Kalshi arbitrage."""
 
 import asyncio
+import heapq
+import inspect
 from dataclasses import dataclass
 from decimal import Decimal
-from typing import Callable, Optional
+from operator import attrgetter
+from typing import Awaitable, Callable, Optional, Union
 
 from rarb.api.gamma import GammaClient
 from rarb.api.kalshi import KalshiClient, KalshiMarket
@@ -14,6 +17,11 @@ from rarb.utils.logging import get_logger
 
 log = get_logger(__name__)
 
+# Prices are compared as integer basis points (1.00 == 10_000)
+BPS_PER_UNIT = 10_000
+
+_by_liquidity = attrgetter("liquidity")
+
 
 @dataclass
 class CrossPlatformOpportunity:
@@ -27,7 +35,9 @@ class CrossPlatformOpportunity:
     max_size: Decimal  # In dollars
 
 
-CrossPlatformCallback = Callable[[CrossPlatformOpportunity], None]
+CrossPlatformCallback = Callable[
+    [CrossPlatformOpportunity], Union[None, Awaitable[None]]
+]
 
 
 class CrossPlatformScanner:
@@ -48,13 +58,18 @@ class CrossPlatformScanner:
     ) -> None:
         settings = get_settings()
 
+        # Clients are created once and reused for every scan so their
+        # connection pools stay warm between polls
         self.gamma = GammaClient()
         self.kalshi = KalshiClient()
         self.matcher = EventMatcher(min_confidence=0.5)
 
         self._on_opportunity = on_opportunity
+        # Callback kind is fixed per scanner, so check it once here
+        self._on_opportunity_is_async = inspect.iscoroutinefunction(on_opportunity)
         self.poll_interval = poll_interval
         self.min_spread = Decimal(str(min_spread))
+        self.min_spread_bps = round(min_spread * BPS_PER_UNIT)
         self.min_liquidity = min_liquidity
         self.max_markets = max_markets
 
@@ -76,9 +91,8 @@ class CrossPlatformScanner:
             min_liquidity=self.min_liquidity,
         )
 
-        # Sort by liquidity and take top N
-        markets.sort(key=lambda m: m.liquidity, reverse=True)
-        markets = markets[:self.max_markets]
+        # Take the top N by liquidity without sorting the whole list
+        markets = heapq.nlargest(self.max_markets, markets, key=_by_liquidity)
 
         self._poly_markets = markets
         log.info("Polymarket markets loaded", count=len(markets))
@@ -103,7 +117,11 @@ class CrossPlatformScanner:
         if not self._poly_markets or not self._kalshi_markets:
             return []
 
-        matches = self.matcher.match_batch(
+        # Matching is pure-Python CPU work (P x K fuzzy comparisons), so a
+        # thread doesn't make it faster; it only keeps the event loop
+        # responsive, since other coroutines get to run at GIL switches
+        matches = await asyncio.to_thread(
+            self.matcher.match_batch,
             self._poly_markets,
             self._kalshi_markets,
         )
@@ -113,42 +131,49 @@ class CrossPlatformScanner:
 
     def find_opportunities(self) -> list[CrossPlatformOpportunity]:
         """Find arbitrage opportunities from matched markets."""
-        opportunities = []
-
+        # First pass filters every match on its integer spread; opportunity
+        # payloads are only built for the (few) matches that clear it
+        min_spread_bps = self.min_spread_bps
+        hits = []
         for match in self._matches:
-            opp = self._check_opportunity(match)
-            if opp:
-                opportunities.append(opp)
-
-        return opportunities
-
-    def _check_opportunity(
-        self,
-        match: MatchedEvent,
-    ) -> Optional[CrossPlatformOpportunity]:
-        """Check if a matched event has an arbitrage opportunity."""
+            prices = self._prices_bps(match)
+            if prices is not None and abs(prices[1] - prices[0]) >= min_spread_bps:
+                hits.append((match, *prices))
+
+        return [
+            self._build_opportunity(match, poly_bps, kalshi_bps)
+            for match, poly_bps, kalshi_bps in hits
+        ]
+
+    @staticmethod
+    def _prices_bps(match: MatchedEvent) -> Optional[tuple[int, int]]:
+        """Polymarket and Kalshi YES prices in basis points, if both are quoted."""
         poly_yes = match.polymarket.yes_price
         kalshi_yes = match.kalshi.yes_ask
 
         if not poly_yes or not kalshi_yes:
             return None
 
-        # Calculate spread
-        spread = abs(kalshi_yes - poly_yes)
-        spread_pct = spread / min(poly_yes, kalshi_yes) if min(poly_yes, kalshi_yes) > 0 else Decimal("0")
+        return round(float(poly_yes) * BPS_PER_UNIT), round(float(kalshi_yes) * BPS_PER_UNIT)
 
-        if spread < self.min_spread:
-            return None
+    def _build_opportunity(
+        self,
+        match: MatchedEvent,
+        poly_bps: int,
+        kalshi_bps: int,
+    ) -> CrossPlatformOpportunity:
+        """Build the opportunity payload for a match that cleared the spread filter."""
+        spread_bps = abs(kalshi_bps - poly_bps)
 
         # Determine direction
-        if kalshi_yes > poly_yes:
+        if kalshi_bps > poly_bps:
             direction = "buy_poly_sell_kalshi"
-            buy_price = poly_yes
-            sell_price = kalshi_yes
         else:
             direction = "buy_kalshi_sell_poly"
-            buy_price = kalshi_yes
-            sell_price = poly_yes
+
+        cheaper_bps = min(poly_bps, kalshi_bps)
+        spread = Decimal(spread_bps) / BPS_PER_UNIT
+        spread_pct = Decimal(spread_bps) / cheaper_bps if cheaper_bps > 0 else Decimal("0")
 
         # Estimate max size based on liquidity
         max_size = min(
@@ -159,8 +184,8 @@ class CrossPlatformScanner:
         return CrossPlatformOpportunity(
             match=match,
             direction=direction,
-            poly_price=poly_yes,
-            kalshi_price=kalshi_yes,
+            poly_price=match.polymarket.yes_price,
+            kalshi_price=match.kalshi.yes_ask,
             spread=spread,
             spread_pct=spread_pct,
             max_size=Decimal(str(max_size)),
@@ -197,9 +222,13 @@ class CrossPlatformScanner:
 
             if self._on_opportunity:
                 try:
-                    result = self._on_opportunity(opp)
-                    if asyncio.iscoroutine(result):
-                        await result
+                    if self._on_opportunity_is_async:
+                        await self._on_opportunity(opp)
+                    else:
+                        result = self._on_opportunity(opp)
+                        # e.g. a partial of an async function
+                        if inspect.isawaitable(result):
+                            await result
                 except Exception as e:
                     log.error("Opportunity callback error", error=str(e))
 
@@ -223,6 +252,11 @@ class CrossPlatformScanner:
             log.error("Kalshi connection failed", error=str(e))
             log.warning("Running in Polymarket-only mode")
 
+        # Scans start on a fixed cadence; the time a scan takes comes out of
+        # the wait rather than being added on top of it
+        loop = asyncio.get_running_loop()
+        next_scan = loop.time()
+
         while self._running:
             try:
                 await self.scan_once()
@@ -241,7 +275,12 @@ class CrossPlatformScanner:
             except Exception as e:
                 log.error("Scan cycle error", error=str(e))
 
-            await asyncio.sleep(self.poll_interval)
+            next_scan += self.poll_interval
+            now = loop.time()
+            if next_scan < now:
+                # Scan overran the interval; start again from now
+                next_scan = now
+            await asyncio.sleep(next_scan - now)
 
     def stop(self) -> None:
         """Stop the scanner."""
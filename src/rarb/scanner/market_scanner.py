@@ -1,9 +1,10 @@
 """Market scanner for polling and tracking markets."""
 
 import asyncio
+import inspect
 from dataclasses import dataclass, field
 from decimal import Decimal
-from typing import Callable, Optional
+from typing import AsyncIterator, Awaitable, Callable, Optional, Union
 
 from rarb.api.clob import ClobClient
 from rarb.api.gamma import GammaClient
@@ -13,24 +14,80 @@ from rarb.utils.logging import get_logger
 
 log = get_logger(__name__)
 
+# Payout of a complete YES + NO set
+_ONE = Decimal("1")
 
-@dataclass
+# Snapshots waiting for callbacks beyond this are dropped (and counted)
+EMIT_QUEUE_SIZE = 10_000
+# Seconds run() waits at shutdown for queued snapshots to reach callbacks
+EMIT_DRAIN_TIMEOUT = 10.0
+
+
+def _top_of_book(yes_orderbook: OrderBook, no_orderbook: OrderBook) -> tuple:
+    """Best bid, best ask and best ask size for the YES then the NO book."""
+    return (
+        yes_orderbook.best_bid,
+        yes_orderbook.best_ask,
+        yes_orderbook.best_ask_size,
+        no_orderbook.best_bid,
+        no_orderbook.best_ask,
+        no_orderbook.best_ask_size,
+    )
+
+
+@dataclass(slots=True)
 class MarketSnapshot:
-    """A snapshot of a market with current orderbook data."""
+    """A snapshot of a market with current orderbook data.
+
+    Derived prices are computed once when the snapshot is built, so every
+    callback reading them shares the same work.
+    """
 
     market: Market
     yes_orderbook: OrderBook
     no_orderbook: OrderBook
 
+    _yes_best_ask: Optional[Decimal] = field(init=False, repr=False, compare=False)
+    _no_best_ask: Optional[Decimal] = field(init=False, repr=False, compare=False)
+    _combined_ask: Optional[Decimal] = field(init=False, repr=False, compare=False)
+    _arbitrage_spread: Optional[Decimal] = field(init=False, repr=False, compare=False)
+    _min_liquidity_at_ask: Optional[Decimal] = field(init=False, repr=False, compare=False)
+
+    # Best bid/ask/ask size of both books, used to spot unchanged markets
+    top_of_book: Optional[tuple] = field(default=None, repr=False, compare=False)
+    # False when the top of book matches the last one emitted for the market
+    changed: bool = field(default=True, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.top_of_book is None:
+            self.top_of_book = _top_of_book(self.yes_orderbook, self.no_orderbook)
+        _, yes_ask, _, _, no_ask, _ = self.top_of_book
+        self._yes_best_ask = yes_ask
+        self._no_best_ask = no_ask
+
+        if yes_ask is None or no_ask is None:
+            self._combined_ask = None
+            self._arbitrage_spread = None
+        else:
+            self._combined_ask = yes_ask + no_ask
+            self._arbitrage_spread = _ONE - self._combined_ask
+
+        yes_size = self.top_of_book[2]
+        no_size = self.top_of_book[5]
+        if yes_size is None or no_size is None:
+            self._min_liquidity_at_ask = None
+        else:
+            self._min_liquidity_at_ask = min(yes_size, no_size)
+
     @property
     def yes_best_ask(self) -> Optional[Decimal]:
         """Best ask price for YES token."""
-        return self.yes_orderbook.best_ask
+        return self._yes_best_ask
 
     @property
     def no_best_ask(self) -> Optional[Decimal]:
         """Best ask price for NO token."""
-        return self.no_orderbook.best_ask
+        return self._no_best_ask
 
     @property
     def yes_best_bid(self) -> Optional[Decimal]:
@@ -45,39 +102,34 @@ class MarketSnapshot:
     @property
     def combined_ask(self) -> Optional[Decimal]:
         """Combined cost to buy both YES and NO at best ask."""
-        yes_ask = self.yes_best_ask
-        no_ask = self.no_best_ask
-        if yes_ask is None or no_ask is None:
-            return None
-        return yes_ask + no_ask
+        return self._combined_ask
 
     @property
     def arbitrage_spread(self) -> Optional[Decimal]:
         """Potential arbitrage profit (1 - combined_ask)."""
-        combined = self.combined_ask
-        if combined is None:
-            return None
-        return Decimal("1") - combined
+        return self._arbitrage_spread
 
     @property
     def min_liquidity_at_ask(self) -> Optional[Decimal]:
         """Minimum size available at best ask for either side."""
-        yes_size = self.yes_orderbook.best_ask_size
-        no_size = self.no_orderbook.best_ask_size
-        if yes_size is None or no_size is None:
-            return None
-        return min(yes_size, no_size)
+        return self._min_liquidity_at_ask
 
 
-@dataclass
+SnapshotCallback = Callable[[MarketSnapshot], Union[None, Awaitable[None]]]
+
+
+@dataclass(slots=True)
 class ScannerState:
     """Current state of the market scanner."""
 
     markets: dict[str, Market] = field(default_factory=dict)
+    # Same markets as a list, for the per-cycle scan iteration
+    market_list: list[Market] = field(default_factory=list)
     snapshots: dict[str, MarketSnapshot] = field(default_factory=dict)
     last_market_refresh: float = 0
     scan_count: int = 0
     error_count: int = 0
+    dropped_snapshots: int = 0
 
 
 class MarketScanner:
@@ -88,6 +140,10 @@ class MarketScanner:
     - Periodically refresh the list of active markets
     - Poll orderbooks for tracked markets
     - Emit snapshots for analysis
+
+    This is the REST polling scanner. For incremental book updates pushed
+    over the CLOB WebSocket, use RealtimeScanner
+    (rarb.scanner.realtime_scanner), which the realtime bot runs on.
     """
 
     def __init__(
@@ -98,6 +154,7 @@ class MarketScanner:
         market_refresh_interval: float = 300,  # 5 minutes
         min_volume: float = 0,
         min_liquidity: float = 0,
+        max_concurrency: int = 20,
     ) -> None:
         settings = get_settings()
 
@@ -108,24 +165,60 @@ class MarketScanner:
         self.min_volume = min_volume
         self.min_liquidity = min_liquidity or settings.min_liquidity_usd
 
+        # Bounds in-flight market scans (each makes two orderbook requests)
+        self._scan_semaphore = asyncio.Semaphore(max_concurrency)
+
         self.state = ScannerState()
         self._running = False
-        self._callbacks: list[Callable[[MarketSnapshot], None]] = []
 
-    def on_snapshot(self, callback: Callable[[MarketSnapshot], None]) -> None:
+        # While run() is active, snapshots are handed to a consumer task via
+        # this queue so slow callbacks don't delay the next scan cycle
+        self._emit_queue: Optional[asyncio.Queue[MarketSnapshot]] = None
+        # Top of book last handed to callbacks, per market id. Snapshots are
+        # compared against this rather than the last scan, so a snapshot
+        # dropped on a full queue still counts as changed next cycle.
+        self._emitted_tops: dict[str, tuple] = {}
+
+        # Callbacks are split by kind at registration time and kept as
+        # tuples, rebuilt on (rare) registration rather than per emit
+        self._sync_callbacks: tuple[Callable[[MarketSnapshot], None], ...] = ()
+        self._async_callbacks: tuple[Callable[[MarketSnapshot], Awaitable[None]], ...] = ()
+
+    def on_snapshot(self, callback: SnapshotCallback) -> None:
         """Register a callback for market snapshots."""
-        self._callbacks.append(callback)
+        if inspect.iscoroutinefunction(callback):
+            self._async_callbacks = (*self._async_callbacks, callback)
+        else:
+            self._sync_callbacks = (*self._sync_callbacks, callback)
 
     async def _emit_snapshot(self, snapshot: MarketSnapshot) -> None:
-        """Emit a snapshot to all registered callbacks."""
-        for callback in self._callbacks:
+        """Emit a snapshot to all registered callbacks.
+
+        Sync callbacks run inline; async callbacks run concurrently so slow
+        I/O in one doesn't hold up the others. An awaitable returned by a
+        callback that wasn't recognised as async is awaited inline.
+        """
+        async_callbacks = self._async_callbacks
+
+        for callback in self._sync_callbacks:
             try:
                 result = callback(snapshot)
-                if asyncio.iscoroutine(result):
+                # Async callables that aren't coroutine functions (partials,
+                # objects with async __call__) land here; still await them
+                if inspect.isawaitable(result):
                     await result
             except Exception as e:
                 log.error("Snapshot callback error", error=str(e))
 
+        if async_callbacks:
+            results = await asyncio.gather(
+                *(callback(snapshot) for callback in async_callbacks),
+                return_exceptions=True,
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    log.error("Snapshot callback error", error=str(result))
+
     async def refresh_markets(self) -> None:
         """Refresh the list of active markets from Gamma API."""
         log.info("Refreshing market list...")
@@ -138,7 +231,13 @@ class MarketScanner:
 
             # Update state
             self.state.markets = {m.id: m for m in markets}
-            self.state.last_market_refresh = asyncio.get_event_loop().time()
+            self.state.market_list = list(self.state.markets.values())
+            self._emitted_tops = {
+                market_id: top
+                for market_id, top in self._emitted_tops.items()
+                if market_id in self.state.markets
+            }
+            self.state.last_market_refresh = asyncio.get_running_loop().time()
 
             log.info("Market list refreshed", count=len(markets))
 
@@ -146,27 +245,56 @@ class MarketScanner:
             log.error("Failed to refresh markets", error=str(e))
             self.state.error_count += 1
 
-    async def scan_market(self, market: Market) -> Optional[MarketSnapshot]:
+    def _fetch_orderbook(
+        self,
+        token_id: str,
+        books: dict[str, "asyncio.Task[OrderBook]"],
+    ) -> "asyncio.Task[OrderBook]":
+        """Get the in-flight orderbook fetch for a token, starting it if needed."""
+        task = books.get(token_id)
+        if task is None:
+            task = books[token_id] = asyncio.ensure_future(self.clob.get_orderbook(token_id))
+        return task
+
+    async def scan_market(
+        self,
+        market: Market,
+        books: Optional[dict[str, "asyncio.Task[OrderBook]"]] = None,
+    ) -> Optional[MarketSnapshot]:
         """
         Scan a single market and return a snapshot.
 
         Args:
             market: The market to scan
+            books: Orderbook fetches for the current cycle, keyed by token id.
+                Markets sharing a token reuse one request instead of each
+                fetching it.
 
         Returns:
             MarketSnapshot or None if scan failed
         """
-        try:
-            # Fetch orderbooks for both tokens concurrently
-            yes_ob, no_ob = await asyncio.gather(
-                self.clob.get_orderbook(market.yes_token.token_id),
-                self.clob.get_orderbook(market.no_token.token_id),
-            )
+        if books is None:
+            books = {}
 
+        try:
+            # Fetch orderbooks for both tokens concurrently. The fetches may be
+            # shared with other markets, so a failure on one side doesn't
+            # cancel the other.
+            async with self._scan_semaphore:
+                yes_ob, no_ob = await asyncio.gather(
+                    self._fetch_orderbook(market.yes_token.token_id, books),
+                    self._fetch_orderbook(market.no_token.token_id, books),
+                )
+
+            # Always carry the fresh books; an unchanged top of book only
+            # marks the snapshot so it isn't emitted again
+            top = _top_of_book(yes_ob, no_ob)
             snapshot = MarketSnapshot(
                 market=market,
                 yes_orderbook=yes_ob,
                 no_orderbook=no_ob,
+                top_of_book=top,
+                changed=top != self._emitted_tops.get(market.id),
             )
 
             return snapshot
@@ -179,48 +307,68 @@ class MarketScanner:
             )
             return None
 
-    async def scan_all_markets(self) -> list[MarketSnapshot]:
+    async def stream_snapshots(self) -> AsyncIterator[MarketSnapshot]:
         """
-        Scan all tracked markets.
+        Scan all tracked markets, yielding snapshots as they complete.
 
-        Returns:
-            List of market snapshots
+        Each snapshot is yielded as soon as both of its orderbooks are in,
+        rather than after the slowest market of the cycle. Scanner state is
+        updated once the whole cycle has been consumed.
+
+        Yields:
+            Market snapshots, in completion order
         """
         snapshots: list[MarketSnapshot] = []
 
-        # Create tasks for all markets
+        # Create tasks for all markets; scan_market's semaphore caps how many
+        # are in flight, so a slow market only holds its own slot. Orderbook
+        # fetches are shared per token for the duration of the cycle.
+        books: dict[str, asyncio.Task[OrderBook]] = {}
         tasks = [
-            self.scan_market(market)
-            for market in self.state.markets.values()
+            asyncio.ensure_future(self.scan_market(market, books))
+            for market in self.state.market_list
         ]
 
-        # Execute concurrently with some rate limiting
-        # Process in batches to avoid overwhelming the API
-        batch_size = 20
-        for i in range(0, len(tasks), batch_size):
-            batch = tasks[i : i + batch_size]
-            results = await asyncio.gather(*batch, return_exceptions=True)
-
-            for result in results:
-                if isinstance(result, MarketSnapshot):
-                    snapshots.append(result)
-                elif isinstance(result, Exception):
-                    log.debug("Scan error in batch", error=str(result))
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    snapshot = await next_done
+                except Exception as e:
+                    log.debug("Scan error", error=str(e))
+                    continue
+                if snapshot is not None:
+                    snapshots.append(snapshot)
+                    yield snapshot
+        finally:
+            # If the consumer stops early (or is cancelled), don't leave
+            # scans and orderbook fetches running; no-op for finished ones
+            for task in (*tasks, *books.values()):
+                task.cancel()
+            books.clear()
 
         # Update state
         self.state.snapshots = {s.market.id: s for s in snapshots}
         self.state.scan_count += 1
 
-        return snapshots
+    async def scan_all_markets(self) -> list[MarketSnapshot]:
+        """
+        Scan all tracked markets.
+
+        Returns:
+            List of market snapshots
+        """
+        return [snapshot async for snapshot in self.stream_snapshots()]
 
     async def run_once(self) -> list[MarketSnapshot]:
         """
         Run a single scan cycle.
 
+        Snapshots are emitted to callbacks as each market finishes scanning.
+
         Returns:
             List of market snapshots
         """
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         current_time = loop.time()
 
         # Check if we need to refresh markets
@@ -228,20 +376,56 @@ class MarketScanner:
         if time_since_refresh >= self.market_refresh_interval or not self.state.markets:
             await self.refresh_markets()
 
-        # Scan markets
-        snapshots = await self.scan_all_markets()
-
-        # Emit snapshots
-        for snapshot in snapshots:
-            await self._emit_snapshot(snapshot)
+        # Scan markets, emitting each snapshot as it arrives
+        dropped_before = self.state.dropped_snapshots
+        snapshots: list[MarketSnapshot] = []
+        async for snapshot in self.stream_snapshots():
+            snapshots.append(snapshot)
+            await self._dispatch_snapshot(snapshot)
+
+        dropped = self.state.dropped_snapshots - dropped_before
+        if dropped:
+            log.warning(
+                "Emit queue full, snapshots dropped",
+                dropped=dropped,
+                total_dropped=self.state.dropped_snapshots,
+            )
 
         return snapshots
 
+    async def _dispatch_snapshot(self, snapshot: MarketSnapshot) -> None:
+        """Emit a snapshot unless its top of book is unchanged."""
+        if not snapshot.changed:
+            # Same top of book as last emitted; callbacks already saw it
+            return
+
+        if self._emit_queue is None:
+            await self._emit_snapshot(snapshot)
+        else:
+            try:
+                self._emit_queue.put_nowait(snapshot)
+            except asyncio.QueueFull:
+                # Not recorded as emitted, so the next cycle retries it
+                self.state.dropped_snapshots += 1
+                return
+        self._emitted_tops[snapshot.market.id] = snapshot.top_of_book
+
+    async def _emit_consumer(self, queue: "asyncio.Queue[MarketSnapshot]") -> None:
+        """Emit queued snapshots to callbacks until cancelled."""
+        while True:
+            snapshot = await queue.get()
+            await self._emit_snapshot(snapshot)
+            queue.task_done()
+
     async def run(self) -> None:
         """
         Run the scanner continuously.
 
         This will poll markets at the configured interval until stopped.
+
+        The scanner runs on whatever event loop it is started on. The CLI
+        starts it on uvloop when installed (`pip install rarb[fast]`) and
+        falls back to the default asyncio loop otherwise.
         """
         self._running = True
         log.info(
@@ -251,6 +435,10 @@ class MarketScanner:
             min_liquidity=self.min_liquidity,
         )
 
+        emit_queue: asyncio.Queue[MarketSnapshot] = asyncio.Queue(maxsize=EMIT_QUEUE_SIZE)
+        self._emit_queue = emit_queue
+        emit_task = asyncio.create_task(self._emit_consumer(emit_queue))
+
         try:
             while self._running:
                 try:
@@ -268,6 +456,15 @@ class MarketScanner:
                 await asyncio.sleep(self.poll_interval)
 
         finally:
+            self._emit_queue = None
+            # Snapshots already queued still reach callbacks, within a bound
+            try:
+                await asyncio.wait_for(emit_queue.join(), EMIT_DRAIN_TIMEOUT)
+            except TimeoutError:
+                log.warning("Timed out emitting queued snapshots", pending=emit_queue.qsize())
+            emit_task.cancel()
+            # Let the consumer finish unwinding before its clients are closed
+            await asyncio.gather(emit_task, return_exceptions=True)
             await self.close()
 
     def stop(self) -> None:
@@ -1,7 +1,8 @@
 """Real-time market scanner using WebSocket streaming."""
 
 import asyncio
-from dataclasses import dataclass, field
+import logging
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Awaitable, Callable, Optional
@@ -25,9 +26,42 @@ log = get_logger(__name__)
 MAX_ASSETS_PER_WS = 500
 # Default number of WebSocket connections
 DEFAULT_WS_CONNECTIONS = 6
-
-
-@dataclass
+# Prices are tracked as integer ticks on the hot path (1.00 == 10_000), which
+# covers Polymarket's finest 0.0001 tick size exactly
+_TICK_DIGITS = 4
+TICKS_PER_UNIT = 10 ** _TICK_DIGITS
+# Sentinel tick value for a side with no quote
+NO_PRICE = -1
+# Pending alert DB writes; further alerts are dropped while it is full
+ALERT_QUEUE_SIZE = 1000
+# Maximum alerts written per wake-up of the alert writer
+ALERT_WRITE_BATCH = 50
+# Seconds run() waits at shutdown for queued alert writes to finish
+ALERT_DRAIN_TIMEOUT = 10.0
+# Pending Slack notifications; further alerts are not notified while it is full
+NOTIFY_QUEUE_SIZE = 100
+# Minimum seconds between Slack notifications for the same market
+NOTIFY_COOLDOWN_SECS = 60.0
+# Near-misses within this many ticks of the threshold are logged (0.5%)
+NEAR_MISS_TICKS = 50
+
+
+def _to_ticks(price: Optional[Decimal]) -> int:
+    """Convert a quoted price to integer ticks (NO_PRICE if missing)."""
+    if price is None:
+        return NO_PRICE
+    return int(price.scaleb(_TICK_DIGITS))
+
+
+def _end_date_utc(market: Market) -> Optional[datetime]:
+    """Market end date as a tz-aware UTC datetime (naive dates are assumed UTC)."""
+    end_date = market.end_date
+    if end_date is None or end_date.tzinfo is not None:
+        return end_date
+    return end_date.replace(tzinfo=timezone.utc)
+
+
+@dataclass(slots=True)
 class MarketPrices:
     """Tracks current prices for a market's YES and NO tokens."""
     market: Market
@@ -38,6 +72,32 @@ class MarketPrices:
     # Size available at best ask prices
     yes_best_ask_size: Optional[Decimal] = None
     no_best_ask_size: Optional[Decimal] = None
+    # Same prices as integer ticks, converted once per update (NO_PRICE if unset)
+    yes_bid_t: int = NO_PRICE
+    yes_ask_t: int = NO_PRICE
+    no_bid_t: int = NO_PRICE
+    no_ask_t: int = NO_PRICE
+    # Profit threshold in ticks, set by the owning scanner so has_arbitrage
+    # doesn't re-read settings per check (falls back to settings if unset)
+    min_profit_ticks: Optional[int] = field(default=None, repr=False)
+    # Market end date normalized to tz-aware UTC once at load
+    end_date_utc: Optional[datetime] = field(default=None, repr=False)
+    # Truncated question text for logs (40) and alert DB rows (60), sliced
+    # once at construction instead of on every log/alert
+    label: str = field(init=False, repr=False)
+    db_name: str = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        question = self.market.question
+        self.label = question[:40]
+        self.db_name = question[:60]
+
+    @property
+    def profit_ticks(self) -> Optional[int]:
+        """Arbitrage profit (1 - combined_ask) in ticks, if both asks are quoted."""
+        if self.yes_ask_t < 0 or self.no_ask_t < 0:
+            return None
+        return TICKS_PER_UNIT - self.yes_ask_t - self.no_ask_t
 
     @property
     def combined_ask(self) -> Optional[Decimal]:
@@ -57,14 +117,16 @@ class MarketPrices:
     @property
     def has_arbitrage(self) -> bool:
         """Check if arbitrage opportunity exists."""
-        profit = self.arbitrage_profit
-        if profit is None:
+        profit_t = self.profit_ticks
+        if profit_t is None:
             return False
-        settings = get_settings()
-        return profit > Decimal(str(settings.min_profit_threshold))
+        min_profit_t = self.min_profit_ticks
+        if min_profit_t is None:
+            min_profit_t = round(get_settings().min_profit_threshold * TICKS_PER_UNIT)
+        return profit_t > min_profit_t
 
 
-@dataclass
+@dataclass(slots=True)
 class ArbitrageAlert:
     """Alert for detected arbitrage opportunity."""
     market: Market
@@ -130,18 +192,46 @@ class RealtimeScanner:
         self._on_arbitrage = on_arbitrage
         self._on_markets_loaded = on_markets_loaded
 
+        # Profit threshold in ticks, so per-message checks are int compares
+        self._min_profit_ticks = round(settings.min_profit_threshold * TICKS_PER_UNIT)
+        # Per-message debug logs are skipped outright unless this module's
+        # logger is enabled for DEBUG, however logging was configured
+        self._debug = logging.getLogger(__name__).isEnabledFor(logging.DEBUG)
+
         # State
         self._markets: dict[str, Market] = {}  # market_id -> Market
-        self._token_to_market: dict[str, str] = {}  # token_id -> market_id
+        # token_id -> (prices, is_yes)
+        self._token_to_side: dict[str, tuple[MarketPrices, bool]] = {}
         self._market_prices: dict[str, MarketPrices] = {}  # market_id -> MarketPrices
+        # Resting ask levels per token, kept current from book snapshots and
+        # SELL-side price changes so best-ask size is a dict lookup
+        self._ask_levels: dict[str, dict[Decimal, Decimal]] = {}  # token_id -> {price: size}
+        self._token_to_client: dict[str, WebSocketClient] = {}  # token_id -> owning connection
         self._running = False
+        # Event loop the scanner runs on, bound once in run() for the hot path;
+        # callers outside run() fall back to the running loop
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Alert DB writes go through one writer task while run() is active
+        self._alert_queue: Optional[asyncio.Queue] = None
+        # Durations of closed opportunities waiting for the alert writer, in
+        # close order per market (market_id -> [(market_name, duration_secs)])
+        self._pending_durations: dict[str, list[tuple[str, float]]] = {}
+        # Slack notifications are likewise handed to one worker task
+        self._notify_queue: Optional[asyncio.Queue] = None
 
         # Track active opportunities for duration calculation
-        self._active_opportunities: dict[str, datetime] = {}  # market_id -> first_seen
+        # Durations use the monotonic loop clock; the wall-clock first_seen is
+        # only kept for the alert's DB row
+        # market_id -> (first_seen_mono, first_seen)
+        self._active_opportunities: dict[str, tuple[float, datetime]] = {}
 
         # Stats
         self._price_updates = 0
         self._arbitrage_alerts = 0
+        # Best sub-threshold profit seen (ticks), for stats logging
+        self._best_near_miss = 0
+        self._best_near_miss_market: Optional[str] = None
 
         log.info(
             "Scanner initialized",
@@ -160,20 +250,53 @@ class RealtimeScanner:
             max_days_until_resolution=self.max_days_until_resolution,
         )
 
+        # Drop markets resolving too far out. Days-until only shrinks, so a
+        # market that passes here keeps passing until the next refresh and
+        # the alert path never has to re-check it
+        now = datetime.now(timezone.utc)
+        max_days = self.max_days_until_resolution
+        markets = [
+            m for m in markets
+            if (end_date := _end_date_utc(m)) is None or (end_date - now).days <= max_days
+        ]
+
         # Sort by liquidity and take top N
         markets.sort(key=lambda m: m.liquidity, reverse=True)
         markets = markets[:self.max_markets]
 
         # Build lookup tables
+        previous_prices = self._market_prices
         self._markets = {}
-        self._token_to_market = {}
+        self._token_to_side = {}
         self._market_prices = {}
 
         for market in markets:
             self._markets[market.id] = market
-            self._token_to_market[market.yes_token.token_id] = market.id
-            self._token_to_market[market.no_token.token_id] = market.id
-            self._market_prices[market.id] = MarketPrices(market=market)
+            old = previous_prices.get(market.id)
+            if (
+                old is not None
+                and old.market.yes_token.token_id == market.yes_token.token_id
+                and old.market.no_token.token_id == market.no_token.token_id
+            ):
+                # Still-subscribed tokens get no fresh book snapshot, so keep
+                # the quotes seen so far; only the market metadata is updated
+                prices = replace(old, market=market, end_date_utc=_end_date_utc(market))
+            else:
+                prices = MarketPrices(
+                    market=market,
+                    min_profit_ticks=self._min_profit_ticks,
+                    end_date_utc=_end_date_utc(market),
+                )
+            self._market_prices[market.id] = prices
+            self._token_to_side[market.yes_token.token_id] = (prices, True)
+            self._token_to_side[market.no_token.token_id] = (prices, False)
+
+        # Drop ask levels for tokens that are no longer tracked
+        self._ask_levels = {
+            token_id: levels
+            for token_id, levels in self._ask_levels.items()
+            if token_id in self._token_to_side
+        }
 
         log.info(
             "Markets loaded",
@@ -199,32 +322,95 @@ class RealtimeScanner:
         log.info("Subscribing to tokens", count=len(token_ids), connections=len(self.ws_clients))
 
         # Distribute tokens across connections
-        # Each connection can handle MAX_ASSETS_PER_WS (500) tokens
+        for i, (client, batch) in enumerate(zip(self.ws_clients, self._assign_tokens(token_ids))):
+            if batch:
+                log.info(f"Connection {i+1}: subscribing to {len(batch)} tokens")
+                await client.subscribe(batch)
+
+    def _assign_tokens(self, token_ids: list[str]) -> list[list[str]]:
+        """Split tokens into per-connection batches and record each token's owner.
+
+        Each connection can handle MAX_ASSETS_PER_WS (500) tokens.
+        """
+        self._token_to_client = {}
+        batches = []
         for i, client in enumerate(self.ws_clients):
             start = i * MAX_ASSETS_PER_WS
             end = start + MAX_ASSETS_PER_WS
             batch = token_ids[start:end]
+            for token_id in batch:
+                self._token_to_client[token_id] = client
+            batches.append(batch)
+        return batches
+
+    async def _resubscribe_changed(self) -> None:
+        """Bring subscriptions in line with a reloaded market list.
+
+        New tokens are subscribed on connections with spare capacity. The
+        market feed client has no unsubscribe, so removed tokens keep
+        streaming until their connection reconnects. They are dropped from
+        the owner map so a reconnect doesn't resubscribe them, and the
+        message handlers ignore them on receipt. All connections are only
+        recycled if the new tokens don't fit.
+        """
+        removed = self._token_to_client.keys() - self._token_to_side.keys()
+        for token_id in removed:
+            del self._token_to_client[token_id]
+        added = [t for t in self._token_to_side if t not in self._token_to_client]
+        if not added:
+            return
+
+        # Spare capacity counts the connection's existing subscriptions,
+        # including removed tokens still subscribed until it reconnects
+        batches = []
+        remaining = added
+        for client in self.ws_clients:
+            spare = max(MAX_ASSETS_PER_WS - client.subscribed_count, 0)
+            batches.append(remaining[:spare])
+            remaining = remaining[spare:]
+
+        if remaining:
+            log.info(
+                "New markets exceed connection capacity, reconnecting all WebSockets",
+                added=len(added),
+                removed=len(removed),
+            )
+            # Reassign everything; reconnects resubscribe from the new owner map
+            self._assign_tokens(list(self._token_to_side))
+            for client in self.ws_clients:
+                client._subscribed_assets.clear()
+                if client._ws:
+                    await client._ws.close()
+            return
+
+        log.info("Subscribing to new market tokens", added=len(added), removed=len(removed))
+        for client, batch in zip(self.ws_clients, batches):
             if batch:
-                log.info(f"Connection {i+1}: subscribing to {len(batch)} tokens")
+                for token_id in batch:
+                    self._token_to_client[token_id] = client
                 await client.subscribe(batch)
 
     def _on_book_update(self, update: OrderBookUpdate) -> None:
         """Handle orderbook snapshot update."""
-        # Get size at best ask price
-        best_ask_size = None
-        if update.asks:
-            best_ask_price = min(a.price for a in update.asks)
-            for a in update.asks:
-                if a.price == best_ask_price:
-                    best_ask_size = a.size
-                    break
+        if update.asset_id not in self._token_to_side:
+            # A token of a market dropped by the last reload; its connection
+            # keeps streaming it until it reconnects, so don't track levels
+            return
+
+        # Snapshot replaces the token's ask levels. The one pass that builds
+        # them is the only walk over the asks; the size at the best ask is
+        # then a lookup
+        levels = {a.price: a.size for a in update.asks}
+        self._ask_levels[update.asset_id] = levels
+        best_ask = update.best_ask
+        best_ask_size = levels.get(best_ask) if best_ask is not None else None
 
         # Debug: log when we receive book updates with size data
-        if best_ask_size is not None and best_ask_size > 0:
+        if self._debug and best_ask_size is not None and best_ask_size > 0:
             log.debug(
                 "Book update with size",
                 asset_id=update.asset_id[:20] + "...",
-                best_ask=float(update.best_ask) if update.best_ask else None,
+                best_ask=float(best_ask) if best_ask else None,
                 best_ask_size=float(best_ask_size),
                 num_asks=len(update.asks),
             )
@@ -232,43 +418,49 @@ class RealtimeScanner:
         self._update_prices(
             update.asset_id,
             update.best_bid,
-            update.best_ask,
+            best_ask,
             best_ask_size,
         )
 
     def _on_price_change(self, change: PriceChange) -> None:
         """Handle real-time price change."""
         self._price_updates += 1
-        best_ask_size = None
+        if change.asset_id not in self._token_to_side:
+            # Untracked token (see _on_book_update)
+            return
 
-        # If this is a SELL-side change at the best ask, use the size directly
-        if (
-            change.side == "SELL"
-            and change.best_ask is not None
-            and change.price == change.best_ask
-        ):
-            best_ask_size = change.size
-        else:
-            # Fall back to cached orderbook for size
-            orderbook = None
-            for client in self.ws_clients:
-                orderbook = client.get_orderbook(change.asset_id)
-                if orderbook:
-                    break
-            if orderbook and orderbook.asks:
-                best_ask_price = min(a.price for a in orderbook.asks)
-                for a in orderbook.asks:
-                    if a.price == best_ask_price:
-                        best_ask_size = a.size
-                        break
+        # BUY-side changes leave the asks alone and pass no size; if the best
+        # ask still moved, _update_prices re-reads its size from the levels
+        best_ask_size = None
+        best_ask = change.best_ask
+        if change.side == "SELL":
+            # SELL-side changes move an ask level; a zero size removes it
+            levels = self._ask_levels.setdefault(change.asset_id, {})
+            if change.size:
+                levels[change.price] = change.size
+            else:
+                levels.pop(change.price, None)
+
+            if change.price == best_ask:
+                # Common case: the change is at the best ask itself
+                best_ask_size = change.size
+            elif best_ask is not None:
+                best_ask_size = levels.get(best_ask)
 
         self._update_prices(
             change.asset_id,
             change.best_bid,
-            change.best_ask,
+            best_ask,
             best_ask_size,
         )
 
+    def _ask_size_at(self, token_id: str, price: Optional[Decimal]) -> Optional[Decimal]:
+        """Size resting at a token's ask price, if that level is known."""
+        levels = self._ask_levels.get(token_id)
+        if not levels or price is None:
+            return None
+        return levels.get(price)
+
     def _update_prices(
         self,
         token_id: str,
@@ -277,134 +469,128 @@ class RealtimeScanner:
         best_ask_size: Optional[Decimal] = None,
     ) -> None:
         """Update prices for a token and check for arbitrage."""
-        market_id = self._token_to_market.get(token_id)
-        if not market_id:
-            return
-
-        market = self._markets.get(market_id)
-        if not market:
+        # One lookup gives both the market's prices and which side this token is
+        entry = self._token_to_side.get(token_id)
+        if entry is None:
             return
-
-        prices = self._market_prices.get(market_id)
-        if not prices:
-            return
-
-        # Update the appropriate side
-        if token_id == market.yes_token.token_id:
+        prices, is_yes = entry
+
+        # Update the appropriate side, noting whether its top of book moved
+        bid_t = _to_ticks(best_bid)
+        ask_t = _to_ticks(best_ask)
+        if is_yes:
+            ask_moved = ask_t != prices.yes_ask_t
+            changed = (
+                ask_moved
+                or bid_t != prices.yes_bid_t
+                or (best_ask_size is not None and best_ask_size != prices.yes_best_ask_size)
+            )
             prices.yes_best_bid = best_bid
             prices.yes_best_ask = best_ask
+            prices.yes_bid_t = bid_t
+            prices.yes_ask_t = ask_t
             if best_ask_size is not None:
                 prices.yes_best_ask_size = best_ask_size
-        elif token_id == market.no_token.token_id:
+            elif ask_moved:
+                # The cached size belonged to the old best ask
+                prices.yes_best_ask_size = self._ask_size_at(token_id, best_ask)
+        else:
+            ask_moved = ask_t != prices.no_ask_t
+            changed = (
+                ask_moved
+                or bid_t != prices.no_bid_t
+                or (best_ask_size is not None and best_ask_size != prices.no_best_ask_size)
+            )
             prices.no_best_bid = best_bid
             prices.no_best_ask = best_ask
+            prices.no_bid_t = bid_t
+            prices.no_ask_t = ask_t
             if best_ask_size is not None:
                 prices.no_best_ask_size = best_ask_size
+            elif ask_moved:
+                # The cached size belonged to the old best ask
+                prices.no_best_ask_size = self._ask_size_at(token_id, best_ask)
 
-        # Check for arbitrage
-        self._check_arbitrage(prices)
+        # Redelivered quotes that don't move the top of book or its size can't
+        # change the alert, so only re-check on an actual move. Size counts:
+        # an opportunity skipped for thin liquidity must be re-alerted once
+        # size arrives at the same price
+        if changed:
+            self._check_arbitrage(prices)
 
     def _check_arbitrage(self, prices: MarketPrices) -> None:
         """Check if market has arbitrage opportunity and trigger alert."""
+        # All comparisons here are on integer ticks; Decimals are only
+        # built once an alert is actually emitted
+        profit_t = prices.profit_ticks
+        min_profit_t = self._min_profit_ticks
+
         # Track near-misses for diagnostics (profit > 0 but below threshold)
-        profit = prices.arbitrage_profit
-        if profit is not None and profit > Decimal("0"):
-            settings = get_settings()
+        if profit_t is not None and 0 < profit_t < min_profit_t:
             # Log near-misses (within 0.5% of threshold) at debug level
-            if profit < Decimal(str(settings.min_profit_threshold)):
-                if profit > Decimal(str(settings.min_profit_threshold)) - Decimal("0.005"):
-                    log.debug(
-                        "Near-miss arbitrage",
-                        market=prices.market.question[:40],
-                        profit=f"{float(profit) * 100:.3f}%",
-                        threshold=f"{settings.min_profit_threshold * 100:.1f}%",
-                        combined=f"${float(prices.combined_ask):.4f}" if prices.combined_ask else "N/A",
-                    )
-                # Track the best near-miss for stats logging
-                if not hasattr(self, '_best_near_miss') or profit > self._best_near_miss:
-                    self._best_near_miss = profit
-                    self._best_near_miss_market = prices.market.question[:40]
+            if self._debug and profit_t > min_profit_t - NEAR_MISS_TICKS:
+                log.debug(
+                    "Near-miss arbitrage",
+                    market=prices.label,
+                    profit=f"{profit_t * 100 / TICKS_PER_UNIT:.3f}%",
+                    threshold=f"{min_profit_t * 100 / TICKS_PER_UNIT:.1f}%",
+                    combined=f"${(TICKS_PER_UNIT - profit_t) / TICKS_PER_UNIT:.4f}",
+                )
+            # Track the best near-miss for stats logging
+            if profit_t > self._best_near_miss:
+                self._best_near_miss = profit_t
+                self._best_near_miss_market = prices.label
 
-        if not prices.has_arbitrage:
+        if profit_t is None or profit_t <= min_profit_t:
             # If this market had an active opportunity that just ended, update its duration
             market_id = prices.market.id
             if market_id in self._active_opportunities:
-                first_seen = self._active_opportunities.pop(market_id)
-                duration_secs = (datetime.now(timezone.utc) - first_seen).total_seconds()
+                first_seen_mono, _ = self._active_opportunities.pop(market_id)
+                loop = self._loop or asyncio.get_running_loop()
+                duration_secs = loop.time() - first_seen_mono
                 log.info(
                     "Opportunity closed",
-                    market=prices.market.question[:40],
+                    market=prices.label,
                     duration_secs=f"{duration_secs:.3f}s",
                 )
                 # Update the alert's duration in the database
-                asyncio.create_task(self._update_alert_duration(
-                    prices.market.question[:60],
-                    duration_secs,
-                ))
+                self._queue_alert_duration(market_id, prices.db_name, duration_secs)
             return
 
-        # Check resolution date - skip markets that resolve too far in the future
-        settings = get_settings()
-        if prices.market.end_date:
-            now = datetime.now(timezone.utc)
-            # Make end_date timezone-aware if it isn't
-            end_date = prices.market.end_date
-            if end_date.tzinfo is None:
-                end_date = end_date.replace(tzinfo=timezone.utc)
-            days_until = (end_date - now).days
-            if days_until > settings.max_days_until_resolution:
-                log.debug(
-                    "Skipping arbitrage - resolution too far",
-                    market=prices.market.question[:30],
-                    days_until=days_until,
-                    max_days=settings.max_days_until_resolution,
-                )
-                return
+        # One clock read serves the duration, logging and the DB row.
+        # Resolution dates were already filtered in load_markets, so days
+        # until resolution is only needed for the log line
+        now = datetime.now(timezone.utc)
+        days_until_resolution = None
+        if prices.end_date_utc is not None:
+            days_until_resolution = (prices.end_date_utc - now).days
 
         # We have an opportunity!
-        combined = prices.combined_ask
-        profit = prices.arbitrage_profit
-
-        if combined is None or profit is None:
-            return
+        combined = Decimal(TICKS_PER_UNIT - profit_t).scaleb(-_TICK_DIGITS)
+        profit = Decimal(profit_t).scaleb(-_TICK_DIGITS)
 
         self._arbitrage_alerts += 1
 
         # Track when opportunity first appeared
         market_id = prices.market.id
-        now = datetime.now(timezone.utc)
-        if market_id not in self._active_opportunities:
-            self._active_opportunities[market_id] = now
-        first_seen = self._active_opportunities[market_id]
-        duration_secs = (now - first_seen).total_seconds()
-
-        # Try to get fresh liquidity data from cached orderbooks if missing
+        loop = self._loop or asyncio.get_running_loop()
+        now_mono = loop.time()
+        opened = self._active_opportunities.get(market_id)
+        if opened is None:
+            opened = self._active_opportunities[market_id] = (now_mono, now)
+        first_seen_mono, first_seen = opened
+        duration_secs = now_mono - first_seen_mono
+
+        # Fill in missing liquidity from the tracked ask levels
         yes_size = prices.yes_best_ask_size
         no_size = prices.no_best_ask_size
 
-        if yes_size is None or no_size is None:
-            # Look up orderbooks from WebSocket clients
-            for client in self.ws_clients:
-                if yes_size is None:
-                    yes_book = client.get_orderbook(prices.market.yes_token.token_id)
-                    if yes_book and yes_book.asks:
-                        best_ask_price = min(a.price for a in yes_book.asks)
-                        for a in yes_book.asks:
-                            if a.price == best_ask_price:
-                                yes_size = a.size
-                                prices.yes_best_ask_size = yes_size  # Update cache
-                                break
-                if no_size is None:
-                    no_book = client.get_orderbook(prices.market.no_token.token_id)
-                    if no_book and no_book.asks:
-                        best_ask_price = min(a.price for a in no_book.asks)
-                        for a in no_book.asks:
-                            if a.price == best_ask_price:
-                                no_size = a.size
-                                prices.no_best_ask_size = no_size  # Update cache
-                                break
-                if yes_size is not None and no_size is not None:
-                    break
+        if yes_size is None:
+            yes_size = self._ask_size_at(prices.market.yes_token.token_id, prices.yes_best_ask)
+            prices.yes_best_ask_size = yes_size  # Update cache
+        if no_size is None:
+            no_size = self._ask_size_at(prices.market.no_token.token_id, prices.no_best_ask)
+            prices.no_best_ask_size = no_size  # Update cache
 
         alert = ArbitrageAlert(
             market=prices.market,
@@ -412,23 +598,14 @@ class RealtimeScanner:
             no_ask=prices.no_best_ask or Decimal("0"),
             combined_cost=combined,
             profit_pct=profit,
-            timestamp=asyncio.get_event_loop().time(),
+            timestamp=now_mono,
             yes_size_available=yes_size or Decimal("0"),
             no_size_available=no_size or Decimal("0"),
         )
 
-        # Calculate days until resolution for logging
-        days_until_resolution = None
-        if prices.market.end_date:
-            now = datetime.now(timezone.utc)
-            end_date = prices.market.end_date
-            if end_date.tzinfo is None:
-                end_date = end_date.replace(tzinfo=timezone.utc)
-            days_until_resolution = (end_date - now).days
-
         log.info(
             "ARBITRAGE DETECTED",
-            market=prices.market.question[:50],
+            market=prices.label,
             yes_ask=f"${float(alert.yes_ask):.4f}",
             no_ask=f"${float(alert.no_ask):.4f}",
             combined=f"${float(alert.combined_cost):.4f}",
@@ -444,30 +621,30 @@ class RealtimeScanner:
             try:
                 result = self._on_arbitrage(alert)
                 if asyncio.iscoroutine(result):
-                    asyncio.create_task(result)
+                    loop.create_task(result)
             except Exception as e:
                 log.error("Arbitrage callback error", error=str(e))
 
         # Save alert to database (non-blocking, creates async task)
         # Duration is set later when opportunity closes via _update_alert_duration
-        self._save_alert(alert, first_seen, None)
+        self._save_alert(
+            alert, first_seen, None, prices.end_date_utc, now, prices.db_name, prices.label
+        )
 
-        # Send Slack notification (already async)
+        # Send Slack notification (sent and rate-limited by the notifier worker)
+        if self._notify_queue is None:
+            # Not running under run(); send directly
+            loop.create_task(self._send_notification(alert))
+            return
         try:
-            notifier = get_notifier()
-            asyncio.create_task(notifier.notify_arbitrage(
-                market=prices.market.question,
-                yes_ask=alert.yes_ask,
-                no_ask=alert.no_ask,
-                combined=alert.combined_cost,
-                profit_pct=alert.profit_pct,
-            ))
-        except Exception as e:
-            log.debug("Slack notification failed", error=str(e))
+            self._notify_queue.put_nowait(alert)
+        except asyncio.QueueFull:
+            log.debug("Notification queue full, skipping", market=prices.label)
 
     async def run(self) -> None:
         """Run the real-time scanner."""
         self._running = True
+        self._loop = asyncio.get_running_loop()
 
         # Initialize database
         await init_async_db()
@@ -476,6 +653,8 @@ class RealtimeScanner:
             "Starting real-time scanner",
             num_connections=self.num_connections,
             max_markets=self.max_markets,
+            # "uvloop" when started through the CLI with the fast extra installed
+            event_loop=type(self._loop).__module__.split(".")[0],
         )
 
         # Load markets
@@ -506,7 +685,56 @@ class RealtimeScanner:
             self._periodic_stats(),
             self._zombie_connection_watchdog(),
         ])
-        await asyncio.gather(*tasks)
+
+        # Single writer for alert inserts, so bursts don't fan out into
+        # one DB task per alert
+        self._alert_queue = asyncio.Queue(maxsize=ALERT_QUEUE_SIZE)
+        writer_task = asyncio.create_task(self._alert_writer(self._alert_queue))
+        # Notifications are sent off the detection path by one worker
+        self._notify_queue = asyncio.Queue(maxsize=NOTIFY_QUEUE_SIZE)
+        notifier_task = asyncio.create_task(self._notifier_loop(self._notify_queue))
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            # Later alerts save directly; what's already queued is written
+            # out before the writer stops
+            alert_queue = self._alert_queue
+            self._alert_queue = None
+            self._notify_queue = None
+            notifier_task.cancel()
+            try:
+                await asyncio.wait_for(alert_queue.join(), ALERT_DRAIN_TIMEOUT)
+            except TimeoutError:
+                log.warning("Timed out writing queued alerts", pending=alert_queue.qsize())
+            writer_task.cancel()
+            await asyncio.gather(writer_task, notifier_task, return_exceptions=True)
+
+    async def _notifier_loop(self, queue: asyncio.Queue) -> None:
+        """Send queued Slack notifications until cancelled, at most one per
+        market every NOTIFY_COOLDOWN_SECS."""
+        last_sent: dict[str, float] = {}  # market_id -> alert timestamp
+        while True:
+            alert = await queue.get()
+            market_id = alert.market.id
+            last = last_sent.get(market_id)
+            if last is not None and alert.timestamp - last < NOTIFY_COOLDOWN_SECS:
+                continue
+            last_sent[market_id] = alert.timestamp
+            await self._send_notification(alert)
+
+    async def _send_notification(self, alert: ArbitrageAlert) -> None:
+        """Send a Slack notification for an alert."""
+        try:
+            notifier = get_notifier()
+            await notifier.notify_arbitrage(
+                market=alert.market.question,
+                yes_ask=alert.yes_ask,
+                no_ask=alert.no_ask,
+                combined=alert.combined_cost,
+                profit_pct=alert.profit_pct,
+            )
+        except Exception as e:
+            log.debug("Slack notification failed", error=str(e))
 
     async def _run_websocket_with_reconnect(self, conn_id: int, client: WebSocketClient) -> None:
         """Run a single WebSocket connection with automatic reconnection."""
@@ -530,11 +758,12 @@ class RealtimeScanner:
             # Reconnect
             try:
                 await client.connect()
-                # Re-subscribe this connection's tokens
-                token_ids = list(self._token_to_market.keys())
-                start = conn_id * MAX_ASSETS_PER_WS
-                end = start + MAX_ASSETS_PER_WS
-                batch = token_ids[start:end]
+                # Re-subscribe the tokens this connection owns
+                batch = [
+                    token_id
+                    for token_id, owner in self._token_to_client.items()
+                    if owner is client
+                ]
                 if batch:
                     await client.subscribe(batch)
             except Exception as e:
@@ -547,18 +776,10 @@ class RealtimeScanner:
 
             try:
                 log.info("Refreshing market list...")
-                old_count = len(self._markets)
                 await self.load_markets()
-                new_count = len(self._markets)
-
-                # Only resubscribe if markets changed significantly
-                if abs(new_count - old_count) > 10:
-                    log.info("Market list changed, reconnecting all WebSockets")
-                    # Close all connections to trigger reconnect
-                    for client in self.ws_clients:
-                        client._subscribed_assets.clear()
-                        if client._ws:
-                            await client._ws.close()
+
+                # Subscribe only what changed rather than reconnecting everything
+                await self._resubscribe_changed()
             except Exception as e:
                 log.error("Market refresh error", error=str(e))
 
@@ -612,9 +833,9 @@ class RealtimeScanner:
             # Include best near-miss in stats if available
             best_spread = None
             best_spread_market = None
-            if hasattr(self, '_best_near_miss') and self._best_near_miss:
-                best_spread = f"{float(self._best_near_miss) * 100:.3f}%"
-                best_spread_market = getattr(self, '_best_near_miss_market', None)
+            if self._best_near_miss:
+                best_spread = f"{self._best_near_miss * 100 / TICKS_PER_UNIT:.3f}%"
+                best_spread_market = self._best_near_miss_market
 
             # Get connection health info
             connection_ages = [
@@ -662,45 +883,92 @@ class RealtimeScanner:
         alert: ArbitrageAlert,
         first_seen: Optional[datetime] = None,
         duration_secs: Optional[float] = None,
+        end_date_utc: Optional[datetime] = None,
+        detected_at: Optional[datetime] = None,
+        market_name: Optional[str] = None,
+        label: Optional[str] = None,
     ) -> None:
         """Save arbitrage alert to database (non-blocking)."""
-        # Schedule async save as a task
-        asyncio.create_task(
-            self._save_alert_async(alert, first_seen, duration_secs)
-        )
+        args = (alert, first_seen, duration_secs, end_date_utc, detected_at, market_name)
+        if self._alert_queue is None:
+            # Not running under run(); schedule the save directly
+            asyncio.create_task(self._save_alert_async(*args))
+            return
+        try:
+            self._alert_queue.put_nowait(args)
+        except asyncio.QueueFull:
+            log.warning("Alert queue full, dropping alert", market=label)
+
+    def _queue_alert_duration(self, market_id: str, market_name: str, duration_secs: float) -> None:
+        """Record a closed opportunity's duration for the alert writer to apply."""
+        if self._alert_queue is None:
+            # Not running under run(); update directly
+            asyncio.create_task(self._update_alert_duration(market_name, duration_secs))
+            return
+        wake_writer = not self._pending_durations
+        # A market can open and close several times before the writer
+        # catches up; every close has its own alert row to update
+        self._pending_durations.setdefault(market_id, []).append((market_name, duration_secs))
+        if wake_writer:
+            try:
+                # None just wakes the writer; if the queue is full it is
+                # awake anyway and flushes once it has drained
+                self._alert_queue.put_nowait(None)
+            except asyncio.QueueFull:
+                pass
+
+    async def _alert_writer(self, queue: asyncio.Queue) -> None:
+        """Write queued alerts and duration updates to the database until cancelled."""
+        while True:
+            # Wait for one alert, then take whatever else has queued up
+            batch = [await queue.get()]
+            while len(batch) < ALERT_WRITE_BATCH and not queue.empty():
+                batch.append(queue.get_nowait())
+            for args in batch:
+                if args is not None:
+                    await self._save_alert_async(*args)
+
+            # Durations are applied once every queued alert has been
+            # written, so an update never runs ahead of its alert's insert
+            if self._pending_durations and queue.empty():
+                pending = self._pending_durations
+                self._pending_durations = {}
+                for durations in pending.values():
+                    for market_name, duration_secs in durations:
+                        await self._update_alert_duration(market_name, duration_secs)
+
+            for _ in batch:
+                queue.task_done()
 
     async def _save_alert_async(
         self,
         alert: ArbitrageAlert,
         first_seen: Optional[datetime] = None,
         duration_secs: Optional[float] = None,
+        end_date_utc: Optional[datetime] = None,
+        detected_at: Optional[datetime] = None,
+        market_name: Optional[str] = None,
     ) -> None:
         """Save arbitrage alert to database asynchronously."""
         try:
-            # Calculate days until resolution
+            now = detected_at or datetime.now(timezone.utc)
+            if end_date_utc is None:
+                end_date_utc = _end_date_utc(alert.market)
+
+            # Days until resolution, plus the resolution date as an ISO string
             days_until = None
-            if alert.market.end_date:
-                now = datetime.now(timezone.utc)
-                end_date = alert.market.end_date
-                if end_date.tzinfo is None:
-                    end_date = end_date.replace(tzinfo=timezone.utc)
-                days_until = (end_date - now).days
-
-            # Include resolution date as ISO string for proper formatting
             resolution_date = None
-            if alert.market.end_date:
-                if alert.market.end_date.tzinfo is None:
-                    resolution_date = alert.market.end_date.replace(tzinfo=timezone.utc).isoformat()
-                else:
-                    resolution_date = alert.market.end_date.isoformat()
+            if end_date_utc is not None:
+                days_until = (end_date_utc - now).days
+                resolution_date = end_date_utc.isoformat()
 
             await AlertRepository.insert(
-                market=alert.market.question[:60],
+                market=market_name or alert.market.question[:60],
                 yes_ask=float(alert.yes_ask),
                 no_ask=float(alert.no_ask),
                 combined=float(alert.combined_cost),
                 profit=float(alert.profit_pct),
-                timestamp=datetime.now(timezone.utc).isoformat(),
+                timestamp=now.isoformat(),
                 platform="polymarket",
                 days_until_resolution=days_until,
                 resolution_date=resolution_date,
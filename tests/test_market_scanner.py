@@ -0,0 +1,81 @@
+"""Tests for MarketScanner's change detection and snapshot emission."""
+
+import asyncio
+from decimal import Decimal
+from types import SimpleNamespace
+
+from rarb.scanner.market_scanner import MarketScanner
+
+
+class FakeClob:
+    """Serves a fixed top of book per token id."""
+
+    def __init__(self) -> None:
+        self.asks: dict[str, Decimal] = {}
+
+    async def get_orderbook(self, token_id: str) -> SimpleNamespace:
+        return SimpleNamespace(
+            best_bid=Decimal("0.40"),
+            best_ask=self.asks.get(token_id, Decimal("0.50")),
+            best_ask_size=Decimal("100"),
+        )
+
+    async def close(self) -> None:
+        pass
+
+
+class FakeGamma:
+    async def close(self) -> None:
+        pass
+
+
+def _market(market_id: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=market_id,
+        yes_token=SimpleNamespace(token_id=f"{market_id}-yes"),
+        no_token=SimpleNamespace(token_id=f"{market_id}-no"),
+    )
+
+
+def _scanner(*market_ids: str) -> tuple[MarketScanner, FakeClob]:
+    clob = FakeClob()
+    scanner = MarketScanner(gamma_client=FakeGamma(), clob_client=clob)
+    markets = [_market(market_id) for market_id in market_ids]
+    scanner.state.markets = {m.id: m for m in markets}
+    scanner.state.market_list = markets
+    # Treat the market list as freshly loaded so run_once doesn't refresh it
+    scanner.state.last_market_refresh = asyncio.get_running_loop().time()
+    return scanner, clob
+
+
+async def test_unchanged_top_of_book_is_emitted_once() -> None:
+    scanner, clob = _scanner("m1", "m2")
+    emitted: list[str] = []
+    scanner.on_snapshot(lambda snapshot: emitted.append(snapshot.market.id))
+
+    await scanner.run_once()
+    await scanner.run_once()
+    assert sorted(emitted) == ["m1", "m2"]
+
+    clob.asks["m1-yes"] = Decimal("0.45")
+    await scanner.run_once()
+    assert sorted(emitted) == ["m1", "m1", "m2"]
+
+
+async def test_dropped_snapshot_is_emitted_next_cycle() -> None:
+    scanner, _ = _scanner("m1", "m2")
+    # No consumer: the first snapshot fills the queue and the second is dropped
+    queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+    scanner._emit_queue = queue
+
+    await scanner.run_once()
+    assert scanner.state.dropped_snapshots == 1
+    queued = queue.get_nowait().market.id
+
+    # Same books next cycle: only the market that was dropped is still changed
+    snapshots = await scanner.run_once()
+    changed = {s.market.id: s.changed for s in snapshots}
+    dropped = "m2" if queued == "m1" else "m1"
+    assert changed == {queued: False, dropped: True}
+    assert queue.get_nowait().market.id == dropped
+    assert scanner.state.dropped_snapshots == 1
@@ -0,0 +1,172 @@
+"""Tests for RealtimeScanner's ask-level tracking and subscription diffing."""
+
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from rarb.scanner.realtime_scanner import MAX_ASSETS_PER_WS, RealtimeScanner
+
+
+class FakeGamma:
+    def __init__(self) -> None:
+        self.markets: list[SimpleNamespace] = []
+
+    async def fetch_all_active_markets(self, **kwargs: object) -> list[SimpleNamespace]:
+        return list(self.markets)
+
+
+class FakeSocket:
+    def __init__(self) -> None:
+        self.closed = False
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class FakeWebSocket:
+    """Records subscriptions the way WebSocketClient tracks them."""
+
+    def __init__(self) -> None:
+        self._subscribed_assets: set[str] = set()
+        self._ws = FakeSocket()
+        self.batches: list[list[str]] = []
+
+    @property
+    def subscribed_count(self) -> int:
+        return len(self._subscribed_assets)
+
+    async def subscribe(self, token_ids: list[str]) -> None:
+        self._subscribed_assets.update(token_ids)
+        self.batches.append(list(token_ids))
+
+
+def _market(market_id: str, liquidity: float = 1000) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=market_id,
+        question=f"Question {market_id}",
+        yes_token=SimpleNamespace(token_id=f"{market_id}-yes"),
+        no_token=SimpleNamespace(token_id=f"{market_id}-no"),
+        end_date=None,
+        liquidity=liquidity,
+    )
+
+
+def _level(price: str, size: str) -> SimpleNamespace:
+    return SimpleNamespace(price=Decimal(price), size=Decimal(size))
+
+
+def _price_change(side: str, price: str, size: str, best_ask: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        asset_id="m1-yes",
+        side=side,
+        price=Decimal(price),
+        size=Decimal(size),
+        best_bid=Decimal("0.50"),
+        best_ask=Decimal(best_ask),
+    )
+
+
+@pytest.fixture
+async def scanner() -> RealtimeScanner:
+    scanner = RealtimeScanner(num_connections=2)
+    scanner.gamma = FakeGamma()
+    scanner.ws_clients = [FakeWebSocket(), FakeWebSocket()]
+    scanner.gamma.markets = [_market("m1"), _market("m2")]
+    await scanner.load_markets()
+    await scanner.subscribe_to_markets()
+    return scanner
+
+
+@pytest.fixture
+def booked(scanner: RealtimeScanner) -> RealtimeScanner:
+    """Scanner whose m1 YES token has received a book snapshot."""
+    scanner._on_book_update(SimpleNamespace(
+        asset_id="m1-yes",
+        asks=[_level("0.55", "10"), _level("0.60", "5")],
+        best_bid=Decimal("0.50"),
+        best_ask=Decimal("0.55"),
+    ))
+    return scanner
+
+
+def test_book_snapshot_sets_levels_and_best_ask_size(booked: RealtimeScanner) -> None:
+    prices = booked._market_prices["m1"]
+    assert booked._ask_levels["m1-yes"] == {
+        Decimal("0.55"): Decimal("10"),
+        Decimal("0.60"): Decimal("5"),
+    }
+    assert prices.yes_best_ask == Decimal("0.55")
+    assert prices.yes_best_ask_size == Decimal("10")
+
+
+def test_sell_change_with_zero_size_removes_level(booked: RealtimeScanner) -> None:
+    booked._on_price_change(_price_change("SELL", "0.55", "0", best_ask="0.60"))
+
+    prices = booked._market_prices["m1"]
+    assert booked._ask_levels["m1-yes"] == {Decimal("0.60"): Decimal("5")}
+    assert prices.yes_best_ask == Decimal("0.60")
+    assert prices.yes_best_ask_size == Decimal("5")
+
+
+def test_ask_move_without_size_rereads_level(booked: RealtimeScanner) -> None:
+    # BUY-side changes carry no ask size; the new best ask's size comes
+    # from the tracked levels instead of the stale cached one
+    booked._on_price_change(_price_change("BUY", "0.50", "20", best_ask="0.60"))
+
+    prices = booked._market_prices["m1"]
+    assert prices.yes_best_ask == Decimal("0.60")
+    assert prices.yes_best_ask_size == Decimal("5")
+
+
+def test_untracked_token_updates_are_ignored(scanner: RealtimeScanner) -> None:
+    scanner._on_book_update(SimpleNamespace(
+        asset_id="gone-yes",
+        asks=[_level("0.40", "1")],
+        best_bid=None,
+        best_ask=Decimal("0.40"),
+    ))
+    scanner._on_price_change(SimpleNamespace(
+        asset_id="gone-yes",
+        side="SELL",
+        price=Decimal("0.45"),
+        size=Decimal("1"),
+        best_bid=None,
+        best_ask=Decimal("0.40"),
+    ))
+    assert "gone-yes" not in scanner._ask_levels
+
+
+async def test_resubscribe_subscribes_added_and_forgets_removed(
+    scanner: RealtimeScanner,
+) -> None:
+    first, second = scanner.ws_clients
+    scanner.gamma.markets = [_market("m2"), _market("m3")]
+    await scanner.load_markets()
+    await scanner._resubscribe_changed()
+
+    # m3 fits on the first connection; m1 is no longer owned, so a
+    # reconnect won't resubscribe it
+    assert first.batches[-1] == ["m3-yes", "m3-no"]
+    assert second.batches == []
+    assert set(scanner._token_to_client) == {"m2-yes", "m2-no", "m3-yes", "m3-no"}
+    assert scanner._token_to_client["m3-yes"] is first
+    assert not first._ws.closed
+
+
+async def test_resubscribe_reconnects_all_when_added_tokens_overflow(
+    scanner: RealtimeScanner,
+) -> None:
+    for i, client in enumerate(scanner.ws_clients):
+        client._subscribed_assets.update(f"other-{i}-{n}" for n in range(MAX_ASSETS_PER_WS))
+
+    scanner.gamma.markets = [_market("m1"), _market("m2"), _market("m3")]
+    await scanner.load_markets()
+    await scanner._resubscribe_changed()
+
+    # Everything is reassigned and every connection is closed, so the
+    # reconnect path resubscribes from the new owner map
+    assert set(scanner._token_to_client) == set(scanner._token_to_side)
+    for client in scanner.ws_clients:
+        assert client._ws.closed
+        assert client.subscribed_count == 0